@@ -63,7 +63,7 @@ async def process_single_activity(
             raise HTTPException(status_code=500, detail="Falha ao baixar o arquivo FIT da Garmin.")
 
         # Etapa 3: Processar com Enhanced System
-        activity_data = garmin_service.process_activity_fit(fit_file_path)
+        activity_data = await garmin_service.process_activity_fit_async(fit_file_path)
         if not activity_data:
             raise HTTPException(status_code=500, detail="Falha ao processar o arquivo FIT baixado.")
 
@@ -96,7 +96,7 @@ async def process_local_activity(
     import os
     try:
         # Verificar se o arquivo existe
-        fit_file_path = os.path.join(garmin_service.activities_dir, f"{activity_id}.fit")
+        fit_file_path = garmin_service.get_activity_file_path(activity_id)
         
         if not os.path.exists(fit_file_path):
             raise HTTPException(
@@ -105,7 +105,7 @@ async def process_local_activity(
             )
 
         # Processar com Enhanced System
-        activity_data = garmin_service.process_activity_fit(fit_file_path)
+        activity_data = await garmin_service.process_activity_fit_async(fit_file_path)
         
         if not activity_data:
             raise HTTPException(status_code=500, detail="Falha ao processar o arquivo FIT.")
@@ -260,14 +260,15 @@ async def process_all_history(
         processed = []
         errors = []
         
-        for fit_file in fit_files:
+        # Processar com Enhanced System, em paralelo entre os núcleos
+        results = await garmin_service.process_activity_fits(
+            [os.path.join(activities_dir, fit_file) for fit_file in fit_files]
+        )
+        
+        for fit_file, activity_data in zip(fit_files, results):
             try:
-                fit_path = os.path.join(activities_dir, fit_file)
                 activity_id = fit_file.replace('.fit', '')
                 
-                # Processar com Enhanced System
-                activity_data = garmin_service.process_activity_fit(fit_path)
-                
                 if activity_data:
                     # Salvar dados processados
                     output_path = os.path.join(activities_dir, f"{activity_id}_processed.json")
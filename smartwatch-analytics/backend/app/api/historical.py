@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 from pydantic import BaseModel
 
 from app.services.garmin_service import temp_auth_storage
-from app.services.historical_backfill import HistoricalBackfillService
+from app.services.historical_backfill import HistoricalBackfillService, HEALTH_SUMMARY_TYPES
 
 router = APIRouter()
 
@@ -60,8 +60,8 @@ async def backfill_complete_activity_history(
         # Padrão: 5 anos
         start_date = end_date - timedelta(days=5 * 365)
     
-    service = HistoricalBackfillService(access_token)
-    result = await service.backfill_complete_activity_history(start_date, end_date)
+    async with HistoricalBackfillService(access_token) as service:
+        result = await service.backfill_complete_activity_history(start_date, end_date)
     
     return {
         "message": "Backfill histórico de atividades iniciado",
@@ -98,16 +98,10 @@ async def backfill_complete_health_history(
             detail="Não autenticado. Faça login primeiro em /auth/garmin/authorize"
         )
     
-    valid_types = [
-        "dailies", "epochs", "sleeps", "stressDetails", "bodyComps",
-        "userMetrics", "pulseOx", "respiration", "healthSnapshot",
-        "hrv", "bloodPressures", "skinTemp"
-    ]
-    
-    if summary_type not in valid_types:
+    if summary_type not in HEALTH_SUMMARY_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Tipo inválido. Use um dos: {', '.join(valid_types)}"
+            detail=f"Tipo inválido. Use um dos: {', '.join(HEALTH_SUMMARY_TYPES)}"
         )
     
     # Parse dates
@@ -124,10 +118,10 @@ async def backfill_complete_health_history(
         # Padrão: 2 anos para health data
         start_date = end_date - timedelta(days=2 * 365)
     
-    service = HistoricalBackfillService(access_token)
-    result = await service.backfill_complete_health_history(
-        summary_type, start_date, end_date
-    )
+    async with HistoricalBackfillService(access_token) as service:
+        result = await service.backfill_complete_health_history(
+            summary_type, start_date, end_date
+        )
     
     return {
         "message": f"Backfill histórico de {summary_type} iniciado",
@@ -164,8 +158,8 @@ async def backfill_all_health_data(
     else:
         start_date = end_date - timedelta(days=2 * 365)
     
-    service = HistoricalBackfillService(access_token)
-    result = await service.backfill_all_health_data(start_date, end_date)
+    async with HistoricalBackfillService(access_token) as service:
+        result = await service.backfill_all_health_data(start_date, end_date)
     
     return {
         "message": "Backfill histórico completo de todos os dados de saúde iniciado",
@@ -208,14 +202,13 @@ async def backfill_everything(
         # Padrão: 5 anos para atividades, 2 anos para health
         start_date = end_date - timedelta(days=5 * 365)
     
-    service = HistoricalBackfillService(access_token)
-    
-    # Fazer backfill de atividades e health em paralelo
-    activity_result = await service.backfill_complete_activity_history(start_date, end_date)
-    
-    # Para health, usar 2 anos
-    health_start = end_date - timedelta(days=2 * 365)
-    health_result = await service.backfill_all_health_data(health_start, end_date)
+    async with HistoricalBackfillService(access_token) as service:
+        # Fazer backfill de atividades e health em paralelo
+        activity_result = await service.backfill_complete_activity_history(start_date, end_date)
+        
+        # Para health, usar 2 anos
+        health_start = end_date - timedelta(days=2 * 365)
+        health_result = await service.backfill_all_health_data(health_start, end_date)
     
     return {
         "message": "Backfill histórico completo iniciado",
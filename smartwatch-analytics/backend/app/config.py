@@ -37,6 +37,10 @@ class Settings(BaseSettings):
     GARMIN_TRAINING_API_URL: str = "https://apis.garmin.com/workoutportal/workout/v2"
     GARMIN_SCHEDULE_API_URL: str = "https://apis.garmin.com/training-api/schedule/"
     GARMIN_ACTIVITY_API_URL: str = "https://apis.garmin.com/wellness-api/rest"
+    # Backfill de health data num único pedido por tipo, sem chunks de 90 dias.
+    # A documentação da Garmin limita cada pedido a 90 dias: só ativar se a
+    # conta aceitar intervalos maiores
+    GARMIN_BACKFILL_BATCH: bool = os.getenv("GARMIN_BACKFILL_BATCH", "false").lower() == "true"
     
     # Escopos para permissões
     GARMIN_SCOPES: str = "WORKOUT_WRITE ACTIVITY_READ"
@@ -63,6 +67,16 @@ class Settings(BaseSettings):
     # Configurações de Redis (serão implementadas na Fase 5)
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
     
+    # Cache dos kernels Numba do Metrics Engine (montar em volume persistente)
+    NUMBA_CACHE_DIR: str = os.getenv("NUMBA_CACHE_DIR", "cache/numba")
+    
+    # Registro (SQLite) dos chunks de backfill já aceitos pela Garmin; vazio desativa
+    BACKFILL_CACHE_PATH: str = os.getenv("BACKFILL_CACHE_PATH", "cache/backfill/backfill.sqlite3")
+    
+    # Arquivos FIT decodificados mantidos em memória por processo (fit_creator), 0 desativa.
+    # Memória: ~20 MB por entrada para 1h de atividade a 1 Hz, em cada worker do pool
+    FIT_DECODE_CACHE_SIZE: int = int(os.getenv("FIT_DECODE_CACHE_SIZE", "4"))
+    
     class Config:
         env_file = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env'))
         case_sensitive = True
@@ -76,11 +90,17 @@ def create_directories():
     directories = [
         settings.UPLOAD_DIR,
         settings.WORKOUTS_DIR,
-        settings.ACTIVITIES_DIR
+        settings.ACTIVITIES_DIR,
+        settings.NUMBA_CACHE_DIR
     ]
     
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
 
 # Criar diretórios na inicialização
-create_directories() 
\ No newline at end of file
+create_directories()
+
+# Numba lê NUMBA_CACHE_DIR ao ser importado: definir antes do Metrics Engine
+os.environ.setdefault("NUMBA_CACHE_DIR", os.path.abspath(settings.NUMBA_CACHE_DIR))
+# fit_creator lê o tamanho do cache no import (herdado pelos processos do pool)
+os.environ.setdefault("FIT_DECODE_CACHE_SIZE", str(settings.FIT_DECODE_CACHE_SIZE)) 
\ No newline at end of file
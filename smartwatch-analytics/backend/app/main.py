@@ -18,7 +18,7 @@ from app.config import settings
 
 # Importar routers
 from app.api import workouts, activities, auth, webhooks, analytics, maps, historical, database_init, data_query, garmin_import
-from app.services.garmin_service import GarminService
+from app.services.garmin_service import GarminService, close_http_client, close_redis_client, shutdown_fit_process_pool
 
 # Configuração de logging
 logging.basicConfig(
@@ -57,6 +57,13 @@ app.include_router(database_init.router, prefix="/db", tags=["Database"])
 app.include_router(data_query.router, prefix="/data", tags=["Consulta de Dados"])
 app.include_router(garmin_import.router, prefix="/historical", tags=["Importação Histórica"])
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Fecha recursos compartilhados no encerramento da aplicação"""
+    await close_http_client()
+    await close_redis_client()
+    shutdown_fit_process_pool()
+
 @app.get("/")
 async def root():
     """Endpoint raiz com informações da API"""
@@ -8,18 +8,29 @@ Por enquanto usa simulação, mas está preparado para API real.
 
 import os
 import uuid
+import json
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timezone, timedelta
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping, Tuple
+from datetime import datetime
 import sys
+import asyncio
 import httpx
 import time
 
+# Importar configurações antes do Metrics Engine (define NUMBA_CACHE_DIR)
+from app.config import settings
+
 # Adicionar o diretório pai para importar o sistema de FIT
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'core'))
 
 try:
-    from fit_creator import criar_treino_fit, ler_treino_fit, ler_atividade_fit
+    from fit_creator import criar_treino_fit, ler_treino_fit, ler_atividade_fit, extrair_dados_atividade
     FIT_SYSTEM_AVAILABLE = True
     print("✅ Sistema de FIT integrado com sucesso!")
 except ImportError as e:
@@ -30,7 +41,7 @@ except ImportError as e:
 # Enhanced FIT System (extração completa + métricas avançadas)
 try:
     from enhanced_fit_parser import EnhancedFITParser
-    from metrics_engine import MetricsEngine
+    from metrics_engine import MetricsEngine, build_record_columns
     ENHANCED_SYSTEM_AVAILABLE = True
     print("✅ Enhanced FIT System integrado com sucesso!")
 except ImportError as e:
@@ -76,7 +87,9 @@ except ImportError as e:
                         }
                     ]
                 }
-            return None
+            raise FileNotFoundError(fit_file_path)
+        except FileNotFoundError:
+            raise
         except Exception:
             return None
 
@@ -92,7 +105,9 @@ except ImportError as e:
                     'max_heart_rate': 165,
                     'average_heart_rate': 145
                 }
-            return None
+            raise FileNotFoundError(fit_file_path)
+        except FileNotFoundError:
+            raise
         except Exception:
             return None
 
@@ -136,7 +151,21 @@ def create_garmin_integration(use_simulator=True):
     """Simulação da função create_garmin_integration"""
     return GarminSimulator()
 
-from app.config import settings
+# Redis é opcional: sem a biblioteca ou sem REDIS_URL, não há cache L2
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+# orjson é opcional: sem a biblioteca, cai no json da stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -146,7 +175,491 @@ logger = logging.getLogger(__name__)
 temp_auth_storage = {}
 
 
-class GarminService:
+class BearerAuth(httpx.Auth):
+    """Injeta o header Authorization a partir do armazenamento de tokens"""
+
+    def __init__(self, storage: Dict[str, Any]):
+        self.storage = storage
+        self._cached_token: Optional[str] = None
+        self._cached_header: Optional[str] = None
+
+    @property
+    def token(self) -> Optional[str]:
+        """Access token atual (None se não autenticado)"""
+        return self.storage.get('access_token')
+
+    def auth_flow(self, request: httpx.Request):
+        # Requisições que já trazem um token explícito não são alteradas
+        if "Authorization" not in request.headers:
+            token = self.token
+            if token:
+                # O header só é reconstruído quando o token muda (ex.: refresh)
+                if token != self._cached_token:
+                    self._cached_token = token
+                    self._cached_header = f"Bearer {token}"
+                request.headers["Authorization"] = self._cached_header
+        yield request
+
+
+bearer_auth = BearerAuth(temp_auth_storage)
+
+# Mapeamentos da estrutura interna de treino para os enums da Garmin API
+# (somente leitura, compartilhados por todas as traduções)
+_INTENSITY_MAP = MappingProxyType({
+    "aquecimento": "WARMUP", "warmup": "WARMUP",
+    "corrida": "ACTIVE", "active": "ACTIVE",
+    "desaquecimento": "COOLDOWN", "cooldown": "COOLDOWN",
+    "recuperacao": "RECOVERY", "recovery": "RECOVERY",
+    "intervalo": "INTERVAL", "interval": "INTERVAL",
+})
+_DURATION_MAP = MappingProxyType({"tempo": "TIME", "time": "TIME", "distancia": "DISTANCE", "distance": "DISTANCE"})
+_TARGET_MAP = MappingProxyType({"ritmo": "PACE", "frequencia_cardiaca": "HEART_RATE"})
+
+
+def _target_range(target_type: str, min_val: Any, max_val: Any) -> Tuple[Any, Any]:
+    """Faixa (low, high) da meta no formato da Garmin (ritmo em s/km vira m/s)"""
+    if min_val is None or max_val is None:
+        return None, None
+    if target_type == "PACE" and max_val > 0 and min_val > 0:
+        # Escalar de propósito: um treino tem no máximo dezenas de passos e o
+        # JSON traduzido já fica em _TRANSLATION_CACHE, então montar arrays
+        # NumPy custaria mais que as duas divisões
+        return 1000 / max_val, 1000 / min_val
+    return min_val, max_val
+
+
+def _build_garmin_step(step_order: int, step_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Passo do treino (estrutura interna) no formato WorkoutStep da Garmin API"""
+    target_type = _TARGET_MAP.get(step_data.get("meta_tipo"), "OPEN")
+    low, high = _target_range(target_type, step_data.get("meta_valor_min"), step_data.get("meta_valor_max"))
+    return {
+        "type": "WorkoutStep",
+        "stepOrder": step_order,
+        "description": step_data.get("nome_do_passo"),
+        "intensity": _INTENSITY_MAP.get(step_data.get("tipo_de_passo"), "ACTIVE"),
+        "durationType": _DURATION_MAP.get(step_data.get("duracao_tipo"), "TIME"),
+        "durationValue": step_data.get("duracao_valor"),
+        "targetType": target_type,
+        "targetValueLow": low,
+        "targetValueHigh": high,
+    }
+
+
+# Campos de enhanced_data repassados como estão na resposta de process_activity_fit
+_ENHANCED_DATA_KEYS = ("file_info", "device_info", "activity_summary", "sessions", "laps")
+
+# Campos escalares copiados de raw_data no resumo do sistema básico (default 0)
+_ACTIVITY_SUMMARY_KEYS = (
+    "total_distance",
+    "total_time",
+    "average_pace",
+    "calories",
+    "max_heart_rate",
+    "average_heart_rate",
+)
+
+# (chave em detailed_metrics, chave em advanced_metrics)
+_DETAILED_METRICS_KEYS = (
+    ("basic_stats", "basic_stats"),
+    ("heart_rate", "heart_rate_analysis"),
+    ("pace_speed", "pace_speed_analysis"),
+    ("elevation", "elevation_analysis"),
+    ("cadence", "cadence_analysis"),
+    ("power", "power_analysis"),
+    ("running_dynamics", "running_dynamics"),
+    ("fatigue", "fatigue_analysis"),
+    ("performance", "performance_score"),
+    ("efficiency", "efficiency_metrics"),
+)
+
+# Regras de insights, uma por métrica: (caminho em advanced_metrics,
+# limite inferior, insight se abaixo, limite superior, insight se acima), com
+# insight = (type, category, mensagem). Sem insight de um lado, o limite é
+# infinito. Métricas ausentes (ou subárvores vazias, em análises parciais)
+# não geram insight; a ordem da tupla é a ordem dos insights.
+INSIGHT_RULES = (
+    (("heart_rate_analysis", "hr_drift_percent"),
+     5, ("positive", "cardiovascular",
+         "Excelente controle de frequência cardíaca! HR Drift baixo ({v}%) mostra boa gestão de esforço."),
+     10, ("warning", "cardiovascular",
+          "HR Drift de {v}% indica que você começou muito forte. Considere um aquecimento mais longo para melhorar eficiência.")),
+    (("fatigue_analysis", "fatigue_index_percent"),
+     -20, ("positive", "performance",
+           "Strong finish! Você acelerou no final (fatigue index: {v}%). Excelente gestão de energia."),
+     15, ("warning", "performance",
+          "Decaimento de {v}% na velocidade. Considere trabalhar resistência para manter o ritmo até o final.")),
+    (("pace_speed_analysis", "consistency_score"),
+     60, ("tip", "pacing",
+          "Pacing irregular (score: {v}/100). Tente manter um ritmo mais constante para melhor eficiência."),
+     85, ("positive", "pacing",
+          "Pacing muito consistente! Score de {v}/100 indica excelente controle de ritmo.")),
+    (("heart_rate_analysis", "zones", "zone5", "percentage"),
+     float("-inf"), None,
+     50, ("warning", "training_load",
+          "Você passou {v}% do tempo em Zona 5 (VO2 Max). Treino de alta intensidade - considere descansar amanhã.")),
+    (("performance_score", "overall_score"),
+     float("-inf"), None,
+     80, ("positive", "overall",
+          "Excelente treino! Performance Score de {v}/100.")),
+)
+
+
+def _dig(data: Optional[Dict[str, Any]], path: Tuple[str, ...]) -> Any:
+    """Percorre dicts aninhados seguindo path; None assim que uma subárvore faltar ou estiver vazia"""
+    for key in path:
+        if not data:
+            return None
+        data = data.get(key)
+    return data
+
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _format_utc(timestamp: int) -> str:
+    """Formata um epoch (segundos) como ISO 8601 UTC, usado apenas em logs"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+# Cache LRU das traduções de treino, indexado pelo digest do treino de origem
+_TRANSLATION_CACHE_SIZE = 256
+_TRANSLATION_CACHE: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+
+# Cliente HTTP compartilhado entre todas as instâncias do GarminService.
+# O serviço é instanciado a cada request (Depends), então o pool de conexões
+# (keep-alive + HTTP/2) fica no módulo para reaproveitar o handshake TLS.
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Cache L2 (Redis) da listagem de atividades: janela arredondada para buckets
+# de 30s, TTL curto e lock curto contra cache stampede
+ACTIVITIES_CACHE_BUCKET_SECONDS = 30
+ACTIVITIES_CACHE_TTL_SECONDS = 30
+ACTIVITIES_CACHE_LOCK_SECONDS = 5
+_redis_client = None
+
+# Pool de processos de process_activity_fits, criado no primeiro lote e reaproveitado
+_fit_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Tamanho do bloco usado ao gravar downloads de arquivos FIT em disco
+FIT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Downloads simultâneos em download_activities_bulk (respeita o rate limit da Garmin)
+FIT_DOWNLOAD_CONCURRENCY = 8
+# Processos usados por process_activity_fits (decodificação FIT é CPU-bound e segura o GIL)
+FIT_PROCESS_MAX_WORKERS = os.cpu_count() or 1
+# Lotes menores que isso rodam em série numa thread: o ida e volta ao pool não compensa
+FIT_PROCESS_MIN_BATCH = 4
+
+
+JSON_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+
+# Dict vazio somente leitura usado como default em lookups aninhados
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _json_loads(content: bytes) -> Any:
+    """Decodifica um corpo JSON bruto (orjson quando disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serializa um payload JSON para bytes (orjson quando disponível)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Retorna o cliente HTTP compartilhado, criando-o no primeiro uso"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            headers={"User-Agent": "runnit/1.0"},
+            auth=bearer_auth,
+        )
+    return _http_client
+
+
+def get_redis_client():
+    """Retorna o cliente Redis compartilhado, ou None se o cache não estiver configurado"""
+    global _redis_client
+    if _redis_client is None and REDIS_AVAILABLE and settings.REDIS_URL:
+        _redis_client = aioredis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Fecha o cliente Redis compartilhado (chamado no shutdown da aplicação)"""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+def get_fit_process_pool() -> ProcessPoolExecutor:
+    """Retorna o pool de processos compartilhado, criando-o no primeiro uso"""
+    global _fit_process_pool
+    if _fit_process_pool is None:
+        # spawn: fork com as threads do servidor rodando pode travar o processo filho
+        _fit_process_pool = ProcessPoolExecutor(
+            max_workers=FIT_PROCESS_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _fit_process_pool
+
+
+def shutdown_fit_process_pool() -> None:
+    """Encerra o pool de processos compartilhado (chamado no shutdown da aplicação)"""
+    global _fit_process_pool
+    if _fit_process_pool is not None:
+        _fit_process_pool.shutdown(cancel_futures=True)
+        _fit_process_pool = None
+
+
+async def close_http_client() -> None:
+    """Fecha o cliente HTTP compartilhado (chamado no shutdown da aplicação)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class ActivityFitProcessor:
+    """
+    Leitura e processamento de arquivos FIT de atividade (parser + métricas)
+    
+    Sem estado nem cliente HTTP: os processos do pool de process_activity_fits
+    instanciam só esta classe, e GarminService a herda.
+    """
+    
+    def read_activity_fit(self, fit_file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Ler arquivo FIT de atividade
+        
+        Args:
+            fit_file_path: Caminho do arquivo FIT
+            
+        Returns:
+            Dados da atividade ou None se erro
+        """
+        try:
+            logger.info("Lendo arquivo FIT de atividade: %s", fit_file_path)
+            
+            # Sem os.path.exists prévio: o leitor abre o arquivo direto e
+            # sinaliza arquivo ausente com FileNotFoundError
+            try:
+                data = ler_atividade_fit(fit_file_path)
+            except FileNotFoundError:
+                logger.error("Arquivo FIT não encontrado: %s", fit_file_path)
+                return None
+            
+            if data:
+                logger.info("Arquivo FIT de atividade lido com sucesso: %s", fit_file_path)
+                return data
+            else:
+                logger.error("Erro ao ler arquivo FIT de atividade: %s", fit_file_path)
+                return None
+                
+        except Exception as e:
+            logger.error("Exceção ao ler arquivo FIT de atividade: %s", e)
+            return None
+    
+    def process_activity_fit(self, fit_file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Processar arquivo FIT de atividade e extrair dados relevantes
+        
+        NOVO: Usa Enhanced FIT Parser + Metrics Engine para extração completa
+        
+        Args:
+            fit_file_path: Caminho do arquivo FIT
+            
+        Returns:
+            Dados processados da atividade ou None se erro
+        """
+        try:
+            logger.info("Processando arquivo FIT de atividade: %s", fit_file_path)
+            
+            # NOVO: Usar Enhanced System se disponível
+            if ENHANCED_SYSTEM_AVAILABLE:
+                logger.info("🚀 Usando Enhanced FIT System (extração completa + métricas avançadas)")
+                
+                # Parse completo do arquivo FIT
+                parser = EnhancedFITParser()
+                # Sem a lista de records: as colunas saem direto das mensagens do decoder
+                enhanced_data, parse_status = parser.parse_with_status(fit_file_path, include_records=False)
+                
+                if parse_status == "failed":
+                    # Nada decodificado: o leitor básico tenta o arquivo por conta própria
+                    logger.warning("Enhanced parser falhou (%s), tentando sistema básico...", parser.errors)
+                    raw_data = self.read_activity_fit(fit_file_path)
+                    if not raw_data:
+                        return None
+                    return self._process_basic_data(fit_file_path, raw_data)
+                
+                if parse_status == "partial" and not enhanced_data.get("sessions"):
+                    # Leitura parcial sem sessão: resumo básico sobre as mensagens
+                    # já decodificadas, sem reabrir e redecodificar o arquivo
+                    logger.warning("Enhanced parser leu o arquivo parcialmente, usando sistema básico...")
+                    if not FIT_SYSTEM_AVAILABLE:
+                        return None
+                    raw_data = extrair_dados_atividade(parser.messages)
+                    return self._process_basic_data(fit_file_path, raw_data)
+                
+                # Records em colunas NumPy, montadas uma vez para todas as métricas
+                record_mesgs = parser.messages.get("record_mesgs", [])
+                columns = build_record_columns(record_mesgs)
+                
+                # Calcular métricas avançadas
+                metrics_engine = MetricsEngine()
+                advanced_metrics = metrics_engine.analyze_activity(enhanced_data, columns)
+                
+                # Estruturar resposta completa
+                enhanced_get = enhanced_data.get
+                metrics_get = advanced_metrics.get
+                processed_data = {
+                    "activity_id": os.path.basename(fit_file_path).replace('.fit', ''),
+                    "fit_file_path": fit_file_path,
+                    "processed_at": datetime.now().isoformat(),
+                    "system_version": "enhanced",
+                    
+                    # Dados completos extraídos do FIT
+                    "enhanced_data": {
+                        **{key: enhanced_get(key) for key in _ENHANCED_DATA_KEYS},
+                        "records_count": len(record_mesgs),
+                        "events_count": len(enhanced_get("events", [])),
+                        "hrv_available": len(enhanced_get("hrv", [])) > 0,
+                    },
+                    
+                    # Métricas avançadas calculadas
+                    "advanced_metrics": advanced_metrics,
+                    
+                    # Resumo rápido para APIs (compatibilidade)
+                    "summary": self._extract_enhanced_summary(advanced_metrics),
+                    
+                    # Métricas detalhadas (para analytics)
+                    "detailed_metrics": {out: metrics_get(src) for out, src in _DETAILED_METRICS_KEYS},
+                    
+                    # Insights automáticos
+                    "insights": self._generate_insights(advanced_metrics)
+                }
+                
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "✅ Atividade processada com Enhanced System: %s (📊 %d pontos extraídos, 🎯 %d laps processados)",
+                        fit_file_path,
+                        processed_data["enhanced_data"]["records_count"],
+                        len(enhanced_data.get('laps') or []),
+                    )
+                
+                return processed_data
+            
+            else:
+                # Fallback: usar sistema básico
+                logger.info("⚠️  Usando sistema básico (legacy)")
+                raw_data = self.read_activity_fit(fit_file_path)
+                
+                if not raw_data:
+                    return None
+                
+                return self._process_basic_data(fit_file_path, raw_data)
+            
+        except Exception as e:
+            logger.error("Exceção ao processar atividade: %s", e)
+            import traceback
+            logger.error(traceback.format_exc())
+            return None
+    
+    def _process_basic_data(self, fit_file_path: str, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Processa dados do sistema básico (fallback)"""
+        return {
+            "activity_id": os.path.basename(fit_file_path).replace('.fit', ''),
+            "fit_file_path": fit_file_path,
+            "processed_at": datetime.now().isoformat(),
+            "system_version": "basic",
+            "raw_data": raw_data,
+            "summary": self._extract_activity_summary(raw_data)
+        }
+    
+    @staticmethod
+    def _extract_enhanced_summary(metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Extrai resumo rápido dos dados enhanced (compatibilidade com APIs existentes)"""
+        try:
+            basic_get = (metrics.get("basic_stats") or _EMPTY).get
+            pace_get = (metrics.get("pace_speed_analysis") or _EMPTY).get
+            
+            return {
+                "sport": basic_get("sport"),
+                "start_time": basic_get("start_time"),
+                "duration_seconds": basic_get("duration_seconds"),
+                "duration_formatted": basic_get("duration_formatted"),
+                "distance_meters": basic_get("distance_meters"),
+                "distance_km": basic_get("distance_km"),
+                "avg_speed_kmh": pace_get("avg_speed_kmh"),
+                "avg_pace_min_per_km": pace_get("avg_pace_min_per_km"),
+                "total_calories": basic_get("total_calories"),
+                "avg_heart_rate": basic_get("avg_heart_rate"),
+                "max_heart_rate": basic_get("max_heart_rate"),
+                "total_ascent": basic_get("total_ascent"),
+                "total_descent": basic_get("total_descent"),
+            }
+        except Exception as e:
+            logger.error("Erro ao extrair enhanced summary: %s", e)
+            return {}
+    
+    def _generate_insights(self, metrics: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Gera insights automáticos baseados nas métricas (ver INSIGHT_RULES)"""
+        insights = []
+        append = insights.append
+        
+        try:
+            for path, lower, below, upper, above in INSIGHT_RULES:
+                value = _dig(metrics, path)
+                if value is None:
+                    continue
+                if value > upper:
+                    insight_type, category, template = above
+                elif value < lower:
+                    insight_type, category, template = below
+                else:
+                    continue
+                append({
+                    "type": insight_type,
+                    "category": category,
+                    "message": template.format(v=value)
+                })
+            
+        except Exception as e:
+            logger.error("Erro ao gerar insights: %s", e)
+        
+        return insights
+    
+    @staticmethod
+    def _extract_activity_summary(raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extrair resumo da atividade dos dados brutos
+        
+        Args:
+            raw_data: Dados brutos do arquivo FIT
+            
+        Returns:
+            Resumo estruturado da atividade
+        """
+        try:
+            # Implementar extração de dados relevantes
+            # Por enquanto, retorna estrutura básica
+            raw_get = raw_data.get
+            return {key: raw_get(key, 0) for key in _ACTIVITY_SUMMARY_KEYS}
+        except Exception as e:
+            logger.error("Erro ao extrair resumo da atividade: %s", e)
+            return {}
+
+
+class GarminService(ActivityFitProcessor):
     """Serviço para integração com Garmin Connect"""
     
     def __init__(self):
@@ -154,16 +667,31 @@ class GarminService:
         self.garmin_integration = create_garmin_integration(use_simulator=False) # Mudado para False
         self.workouts_dir = settings.WORKOUTS_DIR
         self.activities_dir = settings.ACTIVITIES_DIR
+        # Prefixos "dir/" prontos para os caminhos de arquivos FIT
+        self._workouts_prefix = os.path.join(self.workouts_dir, "")
+        self._activities_prefix = os.path.join(self.activities_dir, "")
         self.fit_system_available = FIT_SYSTEM_AVAILABLE
         
         # Manter uma referência ao armazenamento de autenticação
         self.auth_storage = temp_auth_storage
+        self._token_holder = bearer_auth
+
+        # Cliente HTTP compartilhado (pool de conexões reaproveitado entre chamadas)
+        self._client = get_http_client()
 
         # Garantir que os diretórios existem
         os.makedirs(self.workouts_dir, exist_ok=True)
         os.makedirs(self.activities_dir, exist_ok=True)
         
-        logger.info(f"Sistema de FIT disponível: {self.fit_system_available}")
+        # criar/ler FIT usam o sistema REAL quando disponível, senão a simulação
+        if self.fit_system_available:
+            logger.info("Sistema de FIT disponível: usando sistema REAL de criação/leitura de FIT")
+        else:
+            logger.warning("Sistema de FIT indisponível: usando simulação de criação/leitura de FIT")
+    
+    async def aclose(self) -> None:
+        """Fecha o cliente HTTP compartilhado"""
+        await close_http_client()
     
     def is_available(self) -> bool:
         """Verificar se o serviço Garmin está disponível"""
@@ -172,7 +700,7 @@ class GarminService:
             # Na implementação real, verificaria se as credenciais estão válidas
             return True
         except Exception as e:
-            logger.error(f"Erro ao verificar disponibilidade do Garmin: {e}")
+            logger.error("Erro ao verificar disponibilidade do Garmin: %s", e)
             return False
     
     def create_workout_fit(self, workout_data: Dict[str, Any], output_path: str) -> bool:
@@ -187,25 +715,19 @@ class GarminService:
             True se criado com sucesso, False caso contrário
         """
         try:
-            logger.info(f"Criando arquivo FIT para treino: {workout_data.get('nome_do_treino')}")
+            logger.info("Criando arquivo FIT para treino: %s", workout_data.get('nome_do_treino'))
             
-            # Usar o sistema REAL de criação de FIT (se disponível)
-            if self.fit_system_available:
-                logger.info("Usando sistema REAL de criação de FIT")
-                success = criar_treino_fit(workout_data, output_path)
-            else:
-                logger.warning("Usando simulação de criação de FIT")
-                success = criar_treino_fit(workout_data, output_path)
+            success = criar_treino_fit(workout_data, output_path)
             
             if success:
-                logger.info(f"Arquivo FIT criado com sucesso: {output_path}")
+                logger.info("Arquivo FIT criado com sucesso: %s", output_path)
                 return True
             else:
-                logger.error(f"Erro ao criar arquivo FIT: {output_path}")
+                logger.error("Erro ao criar arquivo FIT: %s", output_path)
                 return False
                 
         except Exception as e:
-            logger.error(f"Exceção ao criar arquivo FIT: {e}")
+            logger.error("Exceção ao criar arquivo FIT: %s", e)
             return False
     
     def read_workout_fit(self, fit_file_path: str) -> Optional[Dict[str, Any]]:
@@ -219,105 +741,57 @@ class GarminService:
             Dados do treino ou None se erro
         """
         try:
-            logger.info(f"Lendo arquivo FIT: {fit_file_path}")
-            
-            if not os.path.exists(fit_file_path):
-                logger.error(f"Arquivo FIT não encontrado: {fit_file_path}")
-                return None
+            logger.info("Lendo arquivo FIT: %s", fit_file_path)
             
-            # Usar o sistema REAL de leitura de FIT (se disponível)
-            if self.fit_system_available:
-                logger.info("Usando sistema REAL de leitura de FIT")
+            # Sem os.path.exists prévio: o leitor abre o arquivo direto e
+            # sinaliza arquivo ausente com FileNotFoundError
+            try:
                 data = ler_treino_fit(fit_file_path)
-            else:
-                logger.warning("Usando simulação de leitura de FIT")
-                data = ler_treino_fit(fit_file_path)
-            
-            if data:
-                logger.info(f"Arquivo FIT lido com sucesso: {fit_file_path}")
-                return data
-            else:
-                logger.error(f"Erro ao ler arquivo FIT: {fit_file_path}")
+            except FileNotFoundError:
+                logger.error("Arquivo FIT não encontrado: %s", fit_file_path)
                 return None
-                
-        except Exception as e:
-            logger.error(f"Exceção ao ler arquivo FIT: {e}")
-            return None
-    
-    def read_activity_fit(self, fit_file_path: str) -> Optional[Dict[str, Any]]:
-        """
-        Ler arquivo FIT de atividade
-        
-        Args:
-            fit_file_path: Caminho do arquivo FIT
-            
-        Returns:
-            Dados da atividade ou None se erro
-        """
-        try:
-            logger.info(f"Lendo arquivo FIT de atividade: {fit_file_path}")
-            
-            if not os.path.exists(fit_file_path):
-                logger.error(f"Arquivo FIT não encontrado: {fit_file_path}")
-                return None
-            
-            # Usar o sistema REAL de leitura de FIT (se disponível)
-            if self.fit_system_available:
-                logger.info("Usando sistema REAL de leitura de atividade FIT")
-                data = ler_atividade_fit(fit_file_path)
-            else:
-                logger.warning("Usando simulação de leitura de atividade FIT")
-                data = ler_atividade_fit(fit_file_path)
             
             if data:
-                logger.info(f"Arquivo FIT de atividade lido com sucesso: {fit_file_path}")
+                logger.info("Arquivo FIT lido com sucesso: %s", fit_file_path)
                 return data
             else:
-                logger.error(f"Erro ao ler arquivo FIT de atividade: {fit_file_path}")
+                logger.error("Erro ao ler arquivo FIT: %s", fit_file_path)
                 return None
                 
         except Exception as e:
-            logger.error(f"Exceção ao ler arquivo FIT de atividade: {e}")
+            logger.error("Exceção ao ler arquivo FIT: %s", e)
             return None
     
     def _translate_to_garmin_json(self, workout_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Traduz a estrutura de treino interna para o formato JSON da Garmin API."""
-        intensity_mapping = {
-            "aquecimento": "WARMUP", "warmup": "WARMUP",
-            "corrida": "ACTIVE", "active": "ACTIVE",
-            "desaquecimento": "COOLDOWN", "cooldown": "COOLDOWN",
-            "recuperacao": "RECOVERY", "recovery": "RECOVERY",
-            "intervalo": "INTERVAL", "interval": "INTERVAL",
-        }
-        duration_mapping = {"tempo": "TIME", "time": "TIME", "distancia": "DISTANCE", "distance": "DISTANCE"}
-        target_mapping = {"ritmo": "PACE", "frequencia_cardiaca": "HEART_RATE"}
-
-        garmin_steps = []
-        for i, step_data in enumerate(workout_data.get("passos", [])):
-            garmin_step = {
-                "type": "WorkoutStep",
-                "stepOrder": i + 1,
-                "description": step_data.get("nome_do_passo"),
-                "intensity": intensity_mapping.get(step_data.get("tipo_de_passo"), "ACTIVE"),
-                "durationType": duration_mapping.get(step_data.get("duracao_tipo"), "TIME"),
-                "durationValue": step_data.get("duracao_valor"),
-                "targetType": target_mapping.get(step_data.get("meta_tipo"), "OPEN"),
-                "targetValueLow": None,
-                "targetValueHigh": None,
-            }
+        """
+        Traduz a estrutura de treino interna para o formato JSON da Garmin API.
 
-            min_val = step_data.get("meta_valor_min")
-            max_val = step_data.get("meta_valor_max")
+        O resultado é cacheado por hash do conteúdo do treino (retries e
+        reagendamentos do mesmo treino não refazem a tradução), portanto o
+        dict retornado é compartilhado e não deve ser modificado.
+        """
+        key = hashlib.blake2b(
+            json.dumps(workout_data, sort_keys=True, default=str).encode("utf-8"),
+            digest_size=16,
+        ).digest()
 
-            if min_val is not None and max_val is not None:
-                if garmin_step["targetType"] == "PACE" and max_val > 0 and min_val > 0:
-                    garmin_step["targetValueLow"] = 1000 / max_val
-                    garmin_step["targetValueHigh"] = 1000 / min_val
-                else:
-                    garmin_step["targetValueLow"] = min_val
-                    garmin_step["targetValueHigh"] = max_val
-            
-            garmin_steps.append(garmin_step)
+        cached = _TRANSLATION_CACHE.get(key)
+        if cached is not None:
+            _TRANSLATION_CACHE.move_to_end(key)
+            return cached
+
+        garmin_workout_json = self._build_garmin_json(workout_data)
+        _TRANSLATION_CACHE[key] = garmin_workout_json
+        if len(_TRANSLATION_CACHE) > _TRANSLATION_CACHE_SIZE:
+            _TRANSLATION_CACHE.popitem(last=False)
+        return garmin_workout_json
+
+    def _build_garmin_json(self, workout_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Monta o JSON de treino da Garmin API (sem cache)."""
+        garmin_steps = [
+            _build_garmin_step(i, step_data)
+            for i, step_data in enumerate(workout_data.get("passos", []), 1)
+        ]
         
         # TODO: Detectar o tipo de esporte a partir dos dados do treino
         sport_type = "RUNNING"
@@ -344,40 +818,36 @@ class GarminService:
         Returns:
             ID do treino na Garmin ou None se erro.
         """
-        access_token = self.auth_storage.get('access_token')
-        if not access_token:
+        if not self._token_holder.token:
             logger.error("Não autenticado. Não é possível enviar treino.")
             raise Exception("Não autenticado. Por favor, complete o fluxo OAuth2.")
 
         try:
             workout_json = self._translate_to_garmin_json(workout_data)
-            logger.info(f"Enviando treino para Garmin via API JSON: {workout_json.get('workoutName')}")
-            
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
+            logger.info("Enviando treino para Garmin via API JSON: %s", workout_json.get('workoutName'))
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(settings.GARMIN_TRAINING_API_URL, headers=headers, json=workout_json)
-                response.raise_for_status()
-                response_data = response.json()
-                
-                garmin_workout_id = response_data.get("workoutId")
-                logger.info(f"Treino enviado com sucesso via JSON. Resposta: {response_data}")
-                return str(garmin_workout_id) if garmin_workout_id else None
+            response = await self._client.post(
+                settings.GARMIN_TRAINING_API_URL,
+                content=_json_dumps(workout_json),
+                headers=JSON_HEADERS,
+            )
+            response.raise_for_status()
+            response_data = _json_loads(response.content)
+            
+            garmin_workout_id = response_data.get("workoutId")
+            logger.info("Treino enviado com sucesso via JSON. Resposta: %s", response_data)
+            return str(garmin_workout_id) if garmin_workout_id else None
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Erro de API ao enviar treino JSON: {e.response.status_code} - {e.response.text}")
+            logger.error("Erro de API ao enviar treino JSON: %s - %s", e.response.status_code, e.response.text)
             return None
         except Exception as e:
-            logger.error(f"Exceção ao enviar treino JSON: {e}")
+            logger.error("Exceção ao enviar treino JSON: %s", e)
             return None
 
     async def schedule_workout(self, workout_id: str, schedule_date: str) -> bool:
         """Agenda um treino existente no calendário do usuário."""
-        access_token = self.auth_storage.get('access_token')
-        if not access_token:
+        if not self._token_holder.token:
             logger.error("Não autenticado. Não é possível agendar treino.")
             return False
 
@@ -386,24 +856,26 @@ class GarminService:
                 "workoutId": int(workout_id),
                 "date": schedule_date
             }
-            logger.info(f"Agendando treino {workout_id} para {schedule_date}")
-
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
+            logger.info("Agendando treino %s para %s", workout_id, schedule_date)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(settings.GARMIN_SCHEDULE_API_URL, headers=headers, json=schedule_payload)
+            # Só o status importa: em caso de sucesso o corpo não é lido
+            async with self._client.stream(
+                "POST",
+                settings.GARMIN_SCHEDULE_API_URL,
+                content=_json_dumps(schedule_payload),
+                headers=JSON_HEADERS,
+            ) as response:
+                if response.is_error:
+                    await response.aread()
                 response.raise_for_status()
-                logger.info(f"Treino agendado com sucesso. Status: {response.status_code}")
-                return True
+            logger.info("Treino agendado com sucesso. Status: %s", response.status_code)
+            return True
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Erro de API ao agendar treino: {e.response.status_code} - {e.response.text}")
+            logger.error("Erro de API ao agendar treino: %s - %s", e.response.status_code, e.response.text)
             return False
         except Exception as e:
-            logger.error(f"Exceção ao agendar treino: {e}")
+            logger.error("Exceção ao agendar treino: %s", e)
             return False
     
     async def request_activity_backfill(self, days: int = 30) -> bool:
@@ -411,8 +883,7 @@ class GarminService:
         Solicita um backfill de dados de atividades para os últimos X dias.
         Este é um processo assíncrono.
         """
-        access_token = self.auth_storage.get('access_token')
-        if not access_token:
+        if not self._token_holder.token:
             logger.error("Não autenticado. Não é possível solicitar backfill.")
             return False
 
@@ -420,40 +891,34 @@ class GarminService:
             # Para evitar o erro de 'backfill duplicado', solicitamos uma janela de tempo
             # muito antiga que a Garmin definitivamente não processou antes.
             # Vamos pedir dados de 6 meses atrás (180 dias atrás até 175 dias atrás)
-            end_date = datetime.now(timezone.utc) - timedelta(days=175)
-            start_date = end_date - timedelta(days=5)  # 5 dias de janela
-            
-            # Formata as datas para o formato ISO 8601 exigido pela Garmin
-            start_date_str = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-            end_date_str = end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+            end_ts = int(time.time()) - 175 * SECONDS_PER_DAY
+            start_ts = end_ts - 5 * SECONDS_PER_DAY  # 5 dias de janela
 
             backfill_url = f"{settings.GARMIN_ACTIVITY_API_URL}/backfill/activities"
             params = {
-                "summaryStartTimeInSeconds": int(start_date.timestamp()),
-                "summaryEndTimeInSeconds": int(end_date.timestamp())
+                "summaryStartTimeInSeconds": start_ts,
+                "summaryEndTimeInSeconds": end_ts
             }
             
-            logger.info(f"Solicitando backfill de atividades de {start_date_str} a {end_date.strftime('%Y-%m-%dT%H:%M:%SZ')}")
-            
-            headers = {"Authorization": f"Bearer {access_token}"}
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Solicitando backfill de atividades de %s a %s", _format_utc(start_ts), _format_utc(end_ts))
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(backfill_url, headers=headers, params=params)
-                
-                # Para backfill, o sucesso é um status 202 Accepted
-                if response.status_code == 202:
-                    logger.info("Pedido de backfill aceito com sucesso pela Garmin.")
-                    return True
-                else:
-                    # Se não for 202, trata como erro
-                    response.raise_for_status()
-                    return False # Não deve chegar aqui, mas por segurança
+            response = await self._client.get(backfill_url, params=params)
+            
+            # Para backfill, o sucesso é um status 202 Accepted
+            if response.status_code == 202:
+                logger.info("Pedido de backfill aceito com sucesso pela Garmin.")
+                return True
+            else:
+                # Se não for 202, trata como erro
+                response.raise_for_status()
+                return False # Não deve chegar aqui, mas por segurança
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Erro de API ao solicitar backfill: {e.response.status_code} - {e.response.text}")
+            logger.error("Erro de API ao solicitar backfill: %s - %s", e.response.status_code, e.response.text)
             return False
         except Exception as e:
-            logger.error(f"Exceção ao solicitar backfill: {e}")
+            logger.error("Exceção ao solicitar backfill: %s", e)
             return False
 
     async def request_activity_sync(self, access_token: str) -> bool:
@@ -465,74 +930,97 @@ class GarminService:
             # Para evitar o erro de 'backfill duplicado', solicitamos uma janela de tempo
             # que não seja exatamente os 'últimos X dias'.
             # Aqui, pegamos uma janela de 5 dias terminando 3 dias atrás.
-            end_date = datetime.now(timezone.utc) - timedelta(days=3)
-            start_date = end_date - timedelta(days=5) # Do dia -8 ao dia -3
-
-            # Formata as datas para o formato ISO 8601 exigido pela Garmin
-            start_date_str = start_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-            end_date_str = end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
+            end_ts = int(time.time()) - 3 * SECONDS_PER_DAY
+            start_ts = end_ts - 5 * SECONDS_PER_DAY  # Do dia -8 ao dia -3
 
             backfill_url = f"{settings.GARMIN_ACTIVITY_API_URL}/backfill/activities"
             params = {
-                "summaryStartTimeInSeconds": int(start_date.timestamp()),
-                "summaryEndTimeInSeconds": int(end_date.timestamp())
+                "summaryStartTimeInSeconds": start_ts,
+                "summaryEndTimeInSeconds": end_ts
             }
             
-            logger.info(f"Solicitando backfill de atividades de {start_date_str} a {end_date_str}")
-            logger.info(f"PARÂMETROS EXATOS ENVIADOS PARA A GARMIN: {params}") # <-- LOG DE DEPURAÇÃO
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Solicitando backfill de atividades de %s a %s", _format_utc(start_ts), _format_utc(end_ts))
+            logger.info("PARÂMETROS EXATOS ENVIADOS PARA A GARMIN: %s", params) # <-- LOG DE DEPURAÇÃO
             
             headers = {"Authorization": f"Bearer {access_token}"}
-            async with httpx.AsyncClient() as client:
-                response = await client.get(backfill_url, headers=headers, params=params)
-                
-                # Para backfill, o sucesso é um status 202 Accepted
-                if response.status_code == 202:
-                    logger.info("Pedido de backfill aceito com sucesso pela Garmin.")
-                    return True
-                else:
-                    # Se não for 202, trata como erro
-                    response.raise_for_status()
-                    return False # Não deve chegar aqui, mas por segurança
+            response = await self._client.get(backfill_url, headers=headers, params=params)
+            
+            # Para backfill, o sucesso é um status 202 Accepted
+            if response.status_code == 202:
+                logger.info("Pedido de backfill aceito com sucesso pela Garmin.")
+                return True
+            else:
+                # Se não for 202, trata como erro
+                response.raise_for_status()
+                return False # Não deve chegar aqui, mas por segurança
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Erro de API ao solicitar backfill: {e.response.status_code} - {e.response.text}")
+            logger.error("Erro de API ao solicitar backfill: %s - %s", e.response.status_code, e.response.text)
             return False
         except Exception as e:
-            logger.error(f"Exceção ao solicitar backfill: {e}")
+            logger.error("Exceção ao solicitar backfill: %s", e)
             return False
 
     async def download_activity_fit(self, callback_url: str, activity_id: str) -> Optional[str]:
         """
         Baixa um arquivo FIT de atividade usando a callbackURL recebida via webhook.
         """
-        access_token = self.auth_storage.get('access_token')
-        if not access_token:
+        if not self._token_holder.token:
             logger.error("Não autenticado. Não é possível baixar atividade.")
             return None
         
         try:
-            logger.info(f"Baixando arquivo FIT da atividade {activity_id} de: {callback_url}")
-            headers = {"Authorization": f"Bearer {access_token}"}
+            logger.info("Baixando arquivo FIT da atividade %s de: %s", activity_id, callback_url)
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(callback_url, headers=headers)
+            # Salvar o arquivo em blocos conforme chegam (memória limitada ao bloco)
+            file_path = self.get_activity_file_path(activity_id)
+            async with self._client.stream("GET", callback_url) as response:
+                if response.is_error:
+                    await response.aread()  # corpo usado na mensagem de erro
                 response.raise_for_status()
-
-                # Salvar o arquivo
-                file_path = self.get_activity_file_path(activity_id)
-                with open(file_path, "wb") as f:
-                    f.write(response.content)
-                
-                logger.info(f"Arquivo FIT da atividade {activity_id} salvo em: {file_path}")
-                return file_path
+                try:
+                    with open(file_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(chunk_size=FIT_DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                except BaseException:
+                    # Não deixar um arquivo FIT parcial em disco
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    raise
+            
+            logger.info("Arquivo FIT da atividade %s salvo em: %s", activity_id, file_path)
+            return file_path
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Erro de API ao baixar arquivo FIT: {e.response.status_code} - {e.response.text}")
+            logger.error("Erro de API ao baixar arquivo FIT: %s - %s", e.response.status_code, e.response.text)
             return None
         except Exception as e:
-            logger.error(f"Exceção ao baixar arquivo FIT: {e}")
+            logger.error("Exceção ao baixar arquivo FIT: %s", e)
             return None
 
+    async def download_activities_bulk(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Baixa vários arquivos FIT em paralelo (ex.: webhook de backfill com várias callbackURLs).
+
+        Args:
+            items: Lista de tuplas (callback_url, activity_id)
+
+        Returns:
+            Caminhos dos arquivos salvos, na mesma ordem de items (None para falhas)
+        """
+        semaphore = asyncio.Semaphore(FIT_DOWNLOAD_CONCURRENCY)
+
+        async def download_one(callback_url: str, activity_id: str) -> Optional[str]:
+            async with semaphore:
+                return await self.download_activity_fit(callback_url, activity_id)
+
+        results = await asyncio.gather(
+            *(download_one(callback_url, activity_id) for callback_url, activity_id in items),
+            return_exceptions=True
+        )
+        return [None if isinstance(r, BaseException) else r for r in results]
+
     async def pull_activity(self, activity_id: str, output_path: str) -> bool:
         """
         Baixar atividade da Garmin Connect (PULL)
@@ -545,20 +1033,20 @@ class GarminService:
             True se baixado com sucesso, False caso contrário
         """
         try:
-            logger.info(f"Baixando atividade da Garmin: {activity_id}")
+            logger.info("Baixando atividade da Garmin: %s", activity_id)
             
             # Usar o sistema atual de integração (simulado por enquanto)
             downloaded_file = self.garmin_integration.pull_activity(activity_id, output_path)
             
             if downloaded_file:
-                logger.info(f"Atividade baixada com sucesso: {activity_id} -> {output_path}")
+                logger.info("Atividade baixada com sucesso: %s -> %s", activity_id, output_path)
                 return True
             else:
-                logger.error(f"Erro ao baixar atividade: {activity_id}")
+                logger.error("Erro ao baixar atividade: %s", activity_id)
                 return False
                 
         except Exception as e:
-            logger.error(f"Exceção ao baixar atividade: {e}")
+            logger.error("Exceção ao baixar atividade: %s", e)
             return False
     
     async def list_activities(self) -> List[Dict[str, Any]]:
@@ -566,283 +1054,122 @@ class GarminService:
         Listar atividades recentes da Garmin Connect (PULL).
         Busca atividades das últimas 24 horas.
         """
-        access_token = self.auth_storage.get('access_token')
-        if not access_token:
+        if not self._token_holder.token:
             logger.error("Não autenticado. Não é possível listar atividades.")
             raise Exception("Não autenticado. Por favor, complete o fluxo OAuth2.")
 
         try:
-            end_ts = int(time.time())
+            # Janela alinhada a buckets para que polls próximos compartilhem o cache
+            end_ts = int(time.time()) // ACTIVITIES_CACHE_BUCKET_SECONDS * ACTIVITIES_CACHE_BUCKET_SECONDS
             start_ts = end_ts - (24 * 60 * 60)  # 24 horas
 
-            list_url = f"{settings.GARMIN_ACTIVITY_API_URL}/activities"
-            params = {
-                "uploadStartTimeInSeconds": start_ts,
-                "uploadEndTimeInSeconds": end_ts
-            }
-            
-            logger.info(f"Listando atividades da Garmin de {start_ts} a {end_ts}")
-            
-            headers = {"Authorization": f"Bearer {access_token}"}
+            logger.info("Listando atividades da Garmin de %s a %s", start_ts, end_ts)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(list_url, headers=headers, params=params)
-                response.raise_for_status()
-                activities = response.json()
-                
-                logger.info(f"Encontradas {len(activities)} atividades.")
-                return activities
+            activities = _json_loads(await self._get_activities_cached(start_ts, end_ts))
+            
+            logger.info("Encontradas %s atividades.", len(activities))
+            return activities
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Erro de API ao listar atividades: {e.response.status_code} - {e.response.text}")
+            logger.error("Erro de API ao listar atividades: %s - %s", e.response.status_code, e.response.text)
             return []
         except Exception as e:
-            logger.error(f"Exceção ao listar atividades: {e}")
+            logger.error("Exceção ao listar atividades: %s", e)
             return []
     
-    def process_activity_fit(self, fit_file_path: str) -> Optional[Dict[str, Any]]:
+    async def _fetch_activities(self, start_ts: int, end_ts: int) -> bytes:
+        """Busca a lista de atividades na Garmin e retorna o corpo JSON bruto"""
+        list_url = f"{settings.GARMIN_ACTIVITY_API_URL}/activities"
+        params = {
+            "uploadStartTimeInSeconds": start_ts,
+            "uploadEndTimeInSeconds": end_ts
+        }
+
+        response = await self._client.get(list_url, params=params)
+        response.raise_for_status()
+        return response.content
+
+    async def _get_activities_cached(self, start_ts: int, end_ts: int) -> bytes:
         """
-        Processar arquivo FIT de atividade e extrair dados relevantes
-        
-        NOVO: Usa Enhanced FIT Parser + Metrics Engine para extração completa
-        
-        Args:
-            fit_file_path: Caminho do arquivo FIT
-            
-        Returns:
-            Dados processados da atividade ou None se erro
+        Cache-aside no Redis para a lista de atividades.
+
+        Polls dentro do TTL custam um GET no Redis em vez de uma chamada à
+        Garmin. Um lock (SET NX EX) em volta do miss faz com que acessos
+        simultâneos resultem em uma única chamada upstream. Sem Redis
+        configurado (ou com Redis indisponível), busca direto na Garmin.
         """
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return await self._fetch_activities(start_ts, end_ts)
+
+        # Token identifica o usuário sem expor o valor na chave
+        user_key = hashlib.sha256(self._token_holder.token.encode("utf-8")).hexdigest()[:16]
+        cache_key = f"v1:garmin:activities:{user_key}:{start_ts}:{end_ts}"
+        lock_key = f"{cache_key}:lock"
+
         try:
-            logger.info(f"Processando arquivo FIT de atividade: {fit_file_path}")
-            
-            # NOVO: Usar Enhanced System se disponível
-            if ENHANCED_SYSTEM_AVAILABLE:
-                logger.info("🚀 Usando Enhanced FIT System (extração completa + métricas avançadas)")
-                
-                # Parse completo do arquivo FIT
-                parser = EnhancedFITParser()
-                enhanced_data = parser.parse(fit_file_path)
-                
-                if not enhanced_data:
-                    logger.warning("Enhanced parser falhou, tentando sistema básico...")
-                    raw_data = self.read_activity_fit(fit_file_path)
-                    if not raw_data:
-                        return None
-                    return self._process_basic_data(fit_file_path, raw_data)
-                
-                # Calcular métricas avançadas
-                metrics_engine = MetricsEngine()
-                advanced_metrics = metrics_engine.analyze_activity(enhanced_data)
-                
-                # Estruturar resposta completa
-                processed_data = {
-                    "activity_id": os.path.basename(fit_file_path).replace('.fit', ''),
-                    "fit_file_path": fit_file_path,
-                    "processed_at": datetime.now().isoformat(),
-                    "system_version": "enhanced",
-                    
-                    # Dados completos extraídos do FIT
-                    "enhanced_data": {
-                        "file_info": enhanced_data.get("file_info"),
-                        "device_info": enhanced_data.get("device_info"),
-                        "activity_summary": enhanced_data.get("activity_summary"),
-                        "sessions": enhanced_data.get("sessions"),
-                        "laps": enhanced_data.get("laps"),
-                        "records_count": len(enhanced_data.get("records", [])),
-                        "events_count": len(enhanced_data.get("events", [])),
-                        "hrv_available": len(enhanced_data.get("hrv", [])) > 0,
-                    },
-                    
-                    # Métricas avançadas calculadas
-                    "advanced_metrics": advanced_metrics,
-                    
-                    # Resumo rápido para APIs (compatibilidade)
-                    "summary": self._extract_enhanced_summary(enhanced_data, advanced_metrics),
-                    
-                    # Métricas detalhadas (para analytics)
-                    "detailed_metrics": {
-                        "basic_stats": advanced_metrics.get("basic_stats"),
-                        "heart_rate": advanced_metrics.get("heart_rate_analysis"),
-                        "pace_speed": advanced_metrics.get("pace_speed_analysis"),
-                        "elevation": advanced_metrics.get("elevation_analysis"),
-                        "cadence": advanced_metrics.get("cadence_analysis"),
-                        "power": advanced_metrics.get("power_analysis"),
-                        "running_dynamics": advanced_metrics.get("running_dynamics"),
-                        "fatigue": advanced_metrics.get("fatigue_analysis"),
-                        "performance": advanced_metrics.get("performance_score"),
-                        "efficiency": advanced_metrics.get("efficiency_metrics"),
-                    },
-                    
-                    # Insights automáticos
-                    "insights": self._generate_insights(advanced_metrics)
-                }
-                
-                logger.info(f"✅ Atividade processada com Enhanced System: {fit_file_path}")
-                logger.info(f"   📊 {len(enhanced_data.get('records', []))} pontos extraídos")
-                logger.info(f"   🎯 {len(enhanced_data.get('laps', []))} laps processados")
-                
-                return processed_data
-            
-            else:
-                # Fallback: usar sistema básico
-                logger.info("⚠️  Usando sistema básico (legacy)")
-                raw_data = self.read_activity_fit(fit_file_path)
-                
-                if not raw_data:
-                    return None
-                
-                return self._process_basic_data(fit_file_path, raw_data)
-            
-        except Exception as e:
-            logger.error(f"Exceção ao processar atividade: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return None
-    
-    def _process_basic_data(self, fit_file_path: str, raw_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Processa dados do sistema básico (fallback)"""
-        return {
-            "activity_id": os.path.basename(fit_file_path).replace('.fit', ''),
-            "fit_file_path": fit_file_path,
-            "processed_at": datetime.now().isoformat(),
-            "system_version": "basic",
-            "raw_data": raw_data,
-            "summary": self._extract_activity_summary(raw_data)
-        }
-    
-    def _extract_enhanced_summary(self, enhanced_data: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
-        """Extrai resumo rápido dos dados enhanced (compatibilidade com APIs existentes)"""
-        try:
-            basic_stats = metrics.get("basic_stats", {})
-            hr_analysis = metrics.get("heart_rate_analysis", {})
-            pace_analysis = metrics.get("pace_speed_analysis", {})
-            
-            return {
-                "sport": basic_stats.get("sport"),
-                "start_time": basic_stats.get("start_time"),
-                "duration_seconds": basic_stats.get("duration_seconds"),
-                "duration_formatted": basic_stats.get("duration_formatted"),
-                "distance_meters": basic_stats.get("distance_meters"),
-                "distance_km": basic_stats.get("distance_km"),
-                "avg_speed_kmh": pace_analysis.get("avg_speed_kmh"),
-                "avg_pace_min_per_km": pace_analysis.get("avg_pace_min_per_km"),
-                "total_calories": basic_stats.get("total_calories"),
-                "avg_heart_rate": basic_stats.get("avg_heart_rate"),
-                "max_heart_rate": basic_stats.get("max_heart_rate"),
-                "total_ascent": basic_stats.get("total_ascent"),
-                "total_descent": basic_stats.get("total_descent"),
-            }
+            cached = await redis_client.get(cache_key)
+            if cached is not None:
+                return cached
+
+            if not await redis_client.set(lock_key, b"1", nx=True, ex=ACTIVITIES_CACHE_LOCK_SECONDS):
+                # Outro request já está buscando: aguardar o cache ser preenchido
+                for _ in range(ACTIVITIES_CACHE_LOCK_SECONDS * 4):
+                    await asyncio.sleep(0.25)
+                    cached = await redis_client.get(cache_key)
+                    if cached is not None:
+                        return cached
+                return await self._fetch_activities(start_ts, end_ts)
         except Exception as e:
-            logger.error(f"Erro ao extrair enhanced summary: {e}")
-            return {}
-    
-    def _generate_insights(self, metrics: Dict[str, Any]) -> List[Dict[str, str]]:
-        """Gera insights automáticos baseados nas métricas"""
-        insights = []
-        
+            logger.warning("Cache Redis indisponível, buscando direto na Garmin: %s", e)
+            return await self._fetch_activities(start_ts, end_ts)
+
         try:
-            # HR Drift insight
-            hr_analysis = metrics.get("heart_rate_analysis", {})
-            hr_drift = hr_analysis.get("hr_drift_percent", 0)
-            
-            if hr_drift > 10:
-                insights.append({
-                    "type": "warning",
-                    "category": "cardiovascular",
-                    "message": f"HR Drift de {hr_drift}% indica que você começou muito forte. Considere um aquecimento mais longo para melhorar eficiência."
-                })
-            elif hr_drift < 5:
-                insights.append({
-                    "type": "positive",
-                    "category": "cardiovascular",
-                    "message": f"Excelente controle de frequência cardíaca! HR Drift baixo ({hr_drift}%) mostra boa gestão de esforço."
-                })
-            
-            # Fatigue Index insight
-            fatigue = metrics.get("fatigue_analysis", {})
-            fatigue_index = fatigue.get("fatigue_index_percent", 0)
-            
-            if fatigue_index < -20:
-                insights.append({
-                    "type": "positive",
-                    "category": "performance",
-                    "message": f"Strong finish! Você acelerou no final (fatigue index: {fatigue_index}%). Excelente gestão de energia."
-                })
-            elif fatigue_index > 15:
-                insights.append({
-                    "type": "warning",
-                    "category": "performance",
-                    "message": f"Decaimento de {fatigue_index}% na velocidade. Considere trabalhar resistência para manter o ritmo até o final."
-                })
-            
-            # Consistency insight
-            pace_analysis = metrics.get("pace_speed_analysis", {})
-            consistency = pace_analysis.get("consistency_score", 0)
-            
-            if consistency > 85:
-                insights.append({
-                    "type": "positive",
-                    "category": "pacing",
-                    "message": f"Pacing muito consistente! Score de {consistency}/100 indica excelente controle de ritmo."
-                })
-            elif consistency < 60:
-                insights.append({
-                    "type": "tip",
-                    "category": "pacing",
-                    "message": f"Pacing irregular (score: {consistency}/100). Tente manter um ritmo mais constante para melhor eficiência."
-                })
-            
-            # HR Zones insight
-            zones = hr_analysis.get("zones", {})
-            zone5_pct = zones.get("zone5", {}).get("percentage", 0)
-            
-            if zone5_pct > 50:
-                insights.append({
-                    "type": "warning",
-                    "category": "training_load",
-                    "message": f"Você passou {zone5_pct}% do tempo em Zona 5 (VO2 Max). Treino de alta intensidade - considere descansar amanhã."
-                })
-            
-            # Performance Score insight
-            performance = metrics.get("performance_score", {})
-            score = performance.get("overall_score", 0)
-            
-            if score > 80:
-                insights.append({
-                    "type": "positive",
-                    "category": "overall",
-                    "message": f"Excelente treino! Performance Score de {score}/100."
-                })
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar insights: {e}")
-        
-        return insights
+            content = await self._fetch_activities(start_ts, end_ts)
+            try:
+                await redis_client.set(cache_key, content, ex=ACTIVITIES_CACHE_TTL_SECONDS)
+            except Exception as e:
+                logger.warning("Falha ao gravar atividades no cache Redis: %s", e)
+            return content
+        finally:
+            try:
+                await redis_client.delete(lock_key)
+            except Exception:
+                pass
+
+    async def process_activity_fit_async(self, fit_file_path: str) -> Optional[Dict[str, Any]]:
+        """process_activity_fit numa thread, sem bloquear o event loop durante a decodificação"""
+        return await asyncio.to_thread(self.process_activity_fit, fit_file_path)
     
-    def _extract_activity_summary(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_activity_fits(self, fit_file_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
         """
-        Extrair resumo da atividade dos dados brutos
+        Processa vários arquivos FIT em paralelo, no pool de processos compartilhado
+        
+        Lotes com menos de FIT_PROCESS_MIN_BATCH arquivos rodam em série numa thread.
         
         Args:
-            raw_data: Dados brutos do arquivo FIT
+            fit_file_paths: Caminhos dos arquivos FIT
             
         Returns:
-            Resumo estruturado da atividade
+            Dados processados, na mesma ordem de fit_file_paths (None para falhas)
         """
-        try:
-            # Implementar extração de dados relevantes
-            # Por enquanto, retorna estrutura básica
-            return {
-                "total_distance": raw_data.get("total_distance", 0),
-                "total_time": raw_data.get("total_time", 0),
-                "average_pace": raw_data.get("average_pace", 0),
-                "calories": raw_data.get("calories", 0),
-                "max_heart_rate": raw_data.get("max_heart_rate", 0),
-                "average_heart_rate": raw_data.get("average_heart_rate", 0)
-            }
-        except Exception as e:
-            logger.error(f"Erro ao extrair resumo da atividade: {e}")
-            return {}
+        if not fit_file_paths:
+            return []
+        
+        if len(fit_file_paths) < FIT_PROCESS_MIN_BATCH:
+            # Poucos arquivos: em série numa thread, sem serializar nada para o pool
+            return await asyncio.to_thread(list, map(self.process_activity_fit, fit_file_paths))
+        
+        loop = asyncio.get_running_loop()
+        pool = get_fit_process_pool()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, _process_activity_fit_in_worker, path) for path in fit_file_paths),
+            return_exceptions=True
+        )
+        if any(isinstance(r, BrokenProcessPool) for r in results):
+            # Um processo morreu: o próximo lote sobe um pool novo
+            shutdown_fit_process_pool()
+        return [None if isinstance(r, BaseException) else r for r in results]
     
     def get_workout_file_path(self, workout_id: str) -> str:
         """
@@ -854,7 +1181,7 @@ class GarminService:
         Returns:
             Caminho completo do arquivo
         """
-        return os.path.join(self.workouts_dir, f"{workout_id}.fit")
+        return f"{self._workouts_prefix}{workout_id}.fit"
     
     def get_activity_file_path(self, activity_id: str) -> str:
         """
@@ -866,4 +1193,16 @@ class GarminService:
         Returns:
             Caminho completo do arquivo
         """
-        return os.path.join(self.activities_dir, f"{activity_id}.fit") 
\ No newline at end of file
+        return f"{self._activities_prefix}{activity_id}.fit"
+
+
+# Processador em cada processo do pool de process_activity_fits (sem GarminService)
+_worker_processor: Optional[ActivityFitProcessor] = None
+
+
+def _process_activity_fit_in_worker(fit_file_path: str) -> Optional[Dict[str, Any]]:
+    """Ponto de entrada dos processos do pool (precisa ser uma função de módulo)"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = ActivityFitProcessor()
+    return _worker_processor.process_activity_fit(fit_file_path)
@@ -9,12 +9,19 @@ Serviço de Backfill Histórico Completo
 - Se usuário não sincronizar por dias, Garmin faz PUSH automático via webhooks
 - Após backfill inicial, dados virão automaticamente via webhooks
 
-Este serviço faz backfill inicial com delays conservadores para evitar rate limit.
+Este serviço faz backfill inicial com os chunks em paralelo, limitados por um
+token bucket compartilhado para respeitar o rate limit.
 """
 
+import os
 import logging
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 import httpx
 import asyncio
 
@@ -22,13 +29,330 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Rate limit da Garmin (free tier): 100 requisições por minuto
+BACKFILL_RATE_LIMIT = 100
+BACKFILL_RATE_PERIOD_SECONDS = 60.0
+# Requisições de backfill simultâneas
+BACKFILL_CONCURRENCY = 5
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Tipos de health summary suportados pelo backfill da Wellness API
+HEALTH_SUMMARY_TYPES = (
+    "dailies",
+    "epochs",
+    "sleeps",
+    "stressDetails",
+    "bodyComps",
+    "userMetrics",
+    "pulseOx",
+    "respiration",
+    "healthSnapshot",
+    "hrv",
+    "bloodPressures",
+    "skinTemp",
+)
+
+# Validade de um chunk no registro de backfill: depois disso ele volta a ser solicitado
+BACKFILL_CACHE_TTL_SECONDS = 30 * SECONDS_PER_DAY
+
+# Backoff exponencial com jitter entre tentativas: base * 2^tentativa, até o teto
+BACKFILL_RETRY_BASE_SECONDS = 2.0
+BACKFILL_RATE_LIMIT_BASE_SECONDS = 5.0
+BACKFILL_RETRY_CAP_SECONDS = 30.0
+BACKFILL_RETRY_JITTER = 0.5
+
+# Bytes do corpo de respostas de erro incluídos nos logs
+ERROR_BODY_LOG_LIMIT = 512
+
+
+def _epoch_seconds(value: datetime) -> int:
+    """
+    Epoch em segundos
+    
+    Datetimes sem fuso são horário local do servidor (semântica de
+    datetime.timestamp(), a mesma de antes da conversão em _chunk_ranges);
+    os endpoints passam datetimes com fuso.
+    """
+    return int(value.timestamp())
+
+
+def _utc_isoformat(timestamp: int) -> str:
+    """ISO 8601 (UTC) de um timestamp em segundos"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def _utc_date(timestamp: int) -> str:
+    """Data (UTC, YYYY-MM-DD) de um timestamp em segundos, para logs"""
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+def _body_excerpt(response: httpx.Response) -> str:
+    """Início do corpo da resposta para logs, sem decodificar páginas de erro inteiras"""
+    try:
+        return response.content[:ERROR_BODY_LOG_LIMIT].decode("utf-8", errors="replace")
+    except httpx.ResponseNotRead:
+        return ""
+
+
+def _backoff_seconds(attempt: int, base: float = BACKFILL_RETRY_BASE_SECONDS) -> float:
+    """Backoff exponencial com jitter, para tentativas simultâneas não acordarem juntas"""
+    delay = base * (2 ** attempt) * (1 + random.random() * BACKFILL_RETRY_JITTER)
+    return min(BACKFILL_RETRY_CAP_SECONDS, delay)
+
+
+def _retry_wait_seconds(response: httpx.Response, attempt: int) -> float:
+    """Espera antes de repetir após um 429: usa Retry-After (segundos ou data HTTP)
+    quando presente, senão backoff exponencial com jitter (~5s, 10s, 20s)"""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None:
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    return _backoff_seconds(attempt, BACKFILL_RATE_LIMIT_BASE_SECONDS)
+
+
+def _rate_limit_reset_seconds(value: Optional[str]) -> Optional[float]:
+    """Segundos até o reset da cota (X-RateLimit-Reset em segundos ou epoch)"""
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket assíncrono: no máximo `rate` requisições a cada `period` segundos
+    
+    Ajustado pelas respostas: os headers X-RateLimit-* limitam os tokens ao que o
+    servidor diz restar, e pause() segura todas as aquisições (ex: Retry-After).
+    """
+    
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def pause(self, seconds: float) -> None:
+        """Suspende novas aquisições por `seconds` (nunca encurta uma pausa em curso)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    def update_from_headers(self, headers: httpx.Headers) -> None:
+        """Sincroniza o bucket com X-RateLimit-Remaining / X-RateLimit-Reset, se presentes"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+        self._tokens = min(self._tokens, remaining)
+        if remaining < 1:
+            reset = _rate_limit_reset_seconds(headers.get("X-RateLimit-Reset"))
+            if reset:
+                self.pause(reset)
+    
+    async def acquire(self) -> None:
+        """Aguarda até haver um token disponível e o consome"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+
+class BackfillCache:
+    """
+    Registro persistente (SQLite) dos chunks já aceitos pela Garmin (202 ou 409)
+    
+    Chaveado pelo userId da Garmin, que não muda quando o token é renovado:
+    reexecutar o backfill (ex: após uma queda) pula os chunks já aceitos, e
+    outra conta nunca herda o registro.
+    Registros expiram após ttl_seconds. Falhas do SQLite só desativam o atalho,
+    nunca o backfill.
+    
+    Os métodos bloqueiam (I/O de disco): o serviço os chama via asyncio.to_thread,
+    e o lock serializa o uso da conexão entre as threads.
+    """
+    
+    def __init__(self, path: str, account: str, ttl_seconds: int = BACKFILL_CACHE_TTL_SECONDS):
+        self.path = path
+        self.account = account
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS backfill_done ("
+                "account TEXT, type TEXT, s INTEGER, e INTEGER, at INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (account, type, s, e))"
+            )
+            # Registros criados antes da coluna `at` contam como expirados
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(backfill_done)")}
+            if "at" not in columns:
+                self._conn.execute("ALTER TABLE backfill_done ADD COLUMN at INTEGER NOT NULL DEFAULT 0")
+        return self._conn
+    
+    def done(self, summary_type: str) -> Set[Tuple[int, int]]:
+        """Janelas (start_ts, end_ts) aceitas para o tipo e ainda dentro da validade"""
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT s, e FROM backfill_done WHERE account = ? AND type = ? AND at >= ?",
+                    (self.account, summary_type, int(time.time()) - self.ttl_seconds)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Registro de backfill indisponível: %s", e)
+            return set()
+        return set(rows)
+    
+    def mark_done(self, summary_type: str, chunks: List[Tuple[int, int]]) -> None:
+        """Registra as janelas aceitas (e descarta as expiradas) numa única transação"""
+        if not chunks:
+            return
+        now = int(time.time())
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("BEGIN")
+                conn.execute("DELETE FROM backfill_done WHERE at < ?", (now - self.ttl_seconds,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO backfill_done (account, type, s, e, at) VALUES (?, ?, ?, ?, ?)",
+                    [(self.account, summary_type, start_ts, end_ts, now) for start_ts, end_ts in chunks]
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn is not None and self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.warning("Falha ao gravar registro de backfill: %s", e)
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
 
 class HistoricalBackfillService:
     """Serviço para fazer backfill completo do histórico de dados"""
     
-    def __init__(self, access_token: str):
+    def __init__(self, access_token: str, user_id: Optional[str] = None):
         self.access_token = access_token
+        # userId da Garmin (chave do registro de backfill); buscado na API se omitido
+        self.user_id = user_id
         self.headers = {"Authorization": f"Bearer {access_token}"}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._warmup: Optional[asyncio.Task] = None
+        
+        # Limites compartilhados por todos os chunks deste serviço
+        self._limiter = AsyncRateLimiter(BACKFILL_RATE_LIMIT, BACKFILL_RATE_PERIOD_SECONDS)
+        self._semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        
+        # Registro criado no primeiro _run_chunks, quando o userId é conhecido
+        self._cache: Optional[BackfillCache] = None
+        self._user_id_task: Optional[asyncio.Task] = None
+    
+    async def __aenter__(self) -> "HistoricalBackfillService":
+        self._get_client()
+        # Handshake TLS/ALPN em paralelo com o preparo do backfill
+        self._warmup = asyncio.create_task(self._warm_connection())
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Cliente HTTP reaproveitado por todos os chunks (evita um handshake TLS por requisição)"""
+        if self._client is None:
+            # Com HTTP/2 os chunks simultâneos são multiplexados em poucas
+            # conexões; o teto só cobre fallback para HTTP/1.1
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=BACKFILL_CONCURRENCY * 2,
+                    max_keepalive_connections=BACKFILL_CONCURRENCY * 2,
+                ),
+                headers=self.headers,
+            )
+        return self._client
+    
+    async def _warm_connection(self) -> None:
+        """Abre a conexão com apis.garmin.com antes dos chunks (HEAD na raiz da API, fora do token bucket)"""
+        try:
+            await self._get_client().head(settings.GARMIN_ACTIVITY_API_URL)
+        except httpx.HTTPError as e:
+            logger.debug("Aquecimento da conexão falhou: %s", e)
+    
+    async def _fetch_user_id(self) -> Optional[str]:
+        """userId da Garmin para o token atual (None se a API não responder)"""
+        try:
+            await self._limiter.acquire()
+            response = await self._get_client().get(f"{settings.GARMIN_ACTIVITY_API_URL}/user/id")
+            self._limiter.update_from_headers(response.headers)
+            response.raise_for_status()
+            return str(response.json()["userId"])
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            logger.warning("userId da Garmin indisponível, registro de backfill desativado: %s", e)
+            return None
+    
+    async def _get_cache(self) -> Optional[BackfillCache]:
+        """Registro de backfill da conta, ou None se desativado ou sem userId"""
+        if not settings.BACKFILL_CACHE_PATH:
+            return None
+        if self._cache is None:
+            if self.user_id is None:
+                # Uma busca só, compartilhada pelos tipos que rodam em paralelo
+                if self._user_id_task is None:
+                    self._user_id_task = asyncio.create_task(self._fetch_user_id())
+                self.user_id = await self._user_id_task
+                if self.user_id is None:
+                    return None
+            if self._cache is None:
+                self._cache = BackfillCache(settings.BACKFILL_CACHE_PATH, self.user_id)
+        return self._cache
+    
+    async def aclose(self) -> None:
+        """Fecha o cliente HTTP e o registro de backfill do serviço"""
+        if self._warmup is not None:
+            self._warmup.cancel()
+            self._warmup = None
+        if self._user_id_task is not None:
+            self._user_id_task.cancel()
+            self._user_id_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._cache is not None:
+            await asyncio.to_thread(self._cache.close)
     
     async def backfill_complete_activity_history(
         self, 
@@ -56,34 +380,15 @@ class HistoricalBackfillService:
         # Limite da API: 30 dias por requisição
         chunk_days = 30
         
-        requests_made = []
-        current_start = start_date
+        chunks = self._chunk_ranges(start_date, end_date, chunk_days)
         
-        logger.info(f"Iniciando backfill de atividades de {start_date.date()} a {end_date.date()}")
-        logger.info("⚠️ Usando delays conservadores (10s) para respeitar rate limit da Garmin (100 req/min)")
+        logger.info("Iniciando backfill de atividades de %s a %s (%d chunks)", start_date.date(), end_date.date(), len(chunks))
         
-        while current_start < end_date:
-            current_end = min(current_start + timedelta(days=chunk_days), end_date)
-            
-            success = await self._request_activity_backfill_chunk(current_start, current_end)
-            
-            requests_made.append({
-                "start": current_start.isoformat(),
-                "end": current_end.isoformat(),
-                "success": success
-            })
-            
-            # Avançar para o próximo chunk
-            current_start = current_end
-            
-            # Rate limit: aguardar 10 segundos entre requisições para evitar 429
-            # Free tier: 100 req/min = mínimo 0.6s entre requisições
-            # Usando 10s para ser muito conservador (máximo 6 req/min)
-            # Garmin recomenda não fazer polling excessivo - dados virão via webhooks
-            await asyncio.sleep(10)
+        results = await self._run_chunks("activities", chunks, self._request_activity_backfill_chunk)
         
+        requests_made, successful = self._requests_detail(chunks, results)
         total_requests = len(requests_made)
-        successful = sum(1 for r in requests_made if r["success"])
+        logger.info("Backfill de atividades: %d/%d chunks aceitos", successful, total_requests)
         
         return {
             "type": "activities",
@@ -121,39 +426,18 @@ class HistoricalBackfillService:
             # Após backfill inicial, dados futuros virão automaticamente via webhooks
             start_date = end_date - timedelta(days=1*365)
         
-        # Limite da API: 90 dias por requisição
-        chunk_days = 90
+        # Limite da API: 90 dias por requisição (GARMIN_BACKFILL_BATCH: período inteiro de uma vez)
+        chunk_days = None if settings.GARMIN_BACKFILL_BATCH else 90
         
-        requests_made = []
-        current_start = start_date
+        chunks = self._chunk_ranges(start_date, end_date, chunk_days)
         
-        logger.info(f"Iniciando backfill de {summary_type} de {start_date.date()} a {end_date.date()}")
-        logger.info("⚠️ Usando delays conservadores (10s) para respeitar rate limit da Garmin")
+        logger.info("Iniciando backfill de %s de %s a %s (%d chunks)", summary_type, start_date.date(), end_date.date(), len(chunks))
         
-        while current_start < end_date:
-            current_end = min(current_start + timedelta(days=chunk_days), end_date)
-            
-            success = await self._request_health_backfill_chunk(
-                summary_type, current_start, current_end
-            )
-            
-            requests_made.append({
-                "start": current_start.isoformat(),
-                "end": current_end.isoformat(),
-                "success": success
-            })
-            
-            # Avançar para o próximo chunk
-            current_start = current_end
-            
-            # Rate limit: aguardar 10 segundos entre requisições para evitar 429
-            # Free tier: 100 req/min = mínimo 0.6s entre requisições
-            # Usando 10s para ser muito conservador (máximo 6 req/min)
-            # Health API tem rate limit mais restritivo - Garmin envia dados via webhooks
-            await asyncio.sleep(10)
+        results = await self._run_chunks(summary_type, chunks, self._request_health_backfill_chunk, summary_type)
         
+        requests_made, successful = self._requests_detail(chunks, results)
         total_requests = len(requests_made)
-        successful = sum(1 for r in requests_made if r["success"])
+        logger.info("Backfill de %s: %d/%d chunks aceitos", summary_type, successful, total_requests)
         
         return {
             "type": summary_type,
@@ -188,172 +472,237 @@ class HistoricalBackfillService:
         - bloodPressures
         - skinTemp
         """
-        health_summary_types = [
-            "dailies",
-            "epochs",
-            "sleeps",
-            "stressDetails",
-            "bodyComps",
-            "userMetrics",
-            "pulseOx",
-            "respiration",
-            "healthSnapshot",
-            "hrv",
-            "bloodPressures",
-            "skinTemp"
-        ]
+        # Tipos em paralelo: cada um usa um endpoint próprio e todos dividem o
+        # mesmo semáforo e token bucket, então o rate limit global é respeitado
+        type_results = await asyncio.gather(*[
+            self.backfill_complete_health_history(summary_type, start_date, end_date)
+            for summary_type in HEALTH_SUMMARY_TYPES
+        ], return_exceptions=True)
         
-        results = {}
+        results: Dict[str, Any] = dict.fromkeys(HEALTH_SUMMARY_TYPES)
         
-        for summary_type in health_summary_types:
-            try:
-                result = await self.backfill_complete_health_history(
-                    summary_type, start_date, end_date
-                )
-                results[summary_type] = result
-                
-                # Aguardar entre diferentes tipos para evitar rate limit
-                # Health API tem rate limit mais restritivo - usar 20s entre tipos
-                # São 12 tipos diferentes, então precisa ser muito conservador
-                # Garmin recomenda: não fazer polling - dados virão via webhooks automaticamente
-                await asyncio.sleep(20)
-                
-            except Exception as e:
-                logger.error(f"Erro ao fazer backfill de {summary_type}: {e}")
+        for summary_type, result in zip(HEALTH_SUMMARY_TYPES, type_results):
+            if isinstance(result, Exception):
+                logger.error("Erro ao fazer backfill de %s: %s", summary_type, result)
                 results[summary_type] = {
-                    "error": str(e),
+                    "error": str(result),
                     "success": False
                 }
+            else:
+                results[summary_type] = result
         
         return {
             "status": "completed",
             "summary_types": results,
-            "total_types": len(health_summary_types),
+            "total_types": len(HEALTH_SUMMARY_TYPES),
             "successful_types": sum(1 for r in results.values() if r.get("successful_requests", 0) > 0)
         }
     
+    @staticmethod
+    def _chunk_ranges(start_date: datetime, end_date: datetime, chunk_days: Optional[int]) -> List[Tuple[int, int]]:
+        """
+        Divide [start_date, end_date) em janelas (start_ts, end_ts) de até chunk_days dias (None: uma janela só)
+        
+        O início desce para a meia-noite UTC e as fronteiras internas caem numa
+        grade fixa (múltiplos de chunk_days dias desde o epoch): reexecuções com
+        end_date = agora repetem as mesmas janelas e acertam o registro de backfill.
+        """
+        start_ts = _epoch_seconds(start_date) // SECONDS_PER_DAY * SECONDS_PER_DAY
+        end_ts = _epoch_seconds(end_date)
+        if start_ts >= end_ts:
+            return []
+        if not chunk_days:
+            return [(start_ts, end_ts)]
+        step = chunk_days * SECONDS_PER_DAY
+        bounds = [start_ts, *range((start_ts // step + 1) * step, end_ts, step), end_ts]
+        return list(zip(bounds[:-1], bounds[1:]))
+    
+    @staticmethod
+    def _requests_detail(chunks: List[Tuple[int, int]], results: List[bool]) -> Tuple[List[Dict[str, Any]], int]:
+        """Detalhe por chunk (datas ISO formatadas só aqui) e total de chunks aceitos, numa passada"""
+        requests_made = []
+        successful = 0
+        for (chunk_start, chunk_end), success in zip(chunks, results):
+            successful += success
+            requests_made.append({
+                "start": _utc_isoformat(chunk_start),
+                "end": _utc_isoformat(chunk_end),
+                "success": success
+            })
+        return requests_made, successful
+    
+    async def _run_chunks(self, summary_type: str, chunks: List[Tuple[int, int]], request_chunk, *args) -> List[bool]:
+        """
+        Solicita os chunks em paralelo, pulando os já aceitos em execuções anteriores
+        
+        O semáforo limita a concorrência e o token bucket (em request_chunk) o
+        ritmo de requisições. Retorna o sucesso de cada chunk, na ordem de chunks.
+        """
+        cache = await self._get_cache()
+        # SQLite fora do event loop: os outros tipos seguem com seus chunks enquanto isso
+        done = await asyncio.to_thread(cache.done, summary_type) if cache is not None else set()
+        # Chunk coberto por uma janela já aceita (ex: primeiro chunk de uma
+        # execução que começa mais tarde) também é pulado
+        pending = [
+            (chunk_start, chunk_end) for chunk_start, chunk_end in chunks
+            if not any(s <= chunk_start and chunk_end <= e for s, e in done)
+        ]
+        if len(pending) < len(chunks):
+            logger.info("Backfill de %s: %d chunks já aceitos anteriormente, pulando", summary_type, len(chunks) - len(pending))
+        
+        if self._warmup is not None and pending:
+            # Com a conexão HTTP/2 pronta, os chunks simultâneos a compartilham
+            # em vez de cada um abrir a sua durante o handshake
+            await self._warmup
+            self._warmup = None
+        
+        results = await asyncio.gather(*[
+            self._bounded(request_chunk, *args, chunk_start, chunk_end)
+            for chunk_start, chunk_end in pending
+        ])
+        
+        accepted = dict(zip(pending, results))
+        if cache is not None:
+            await asyncio.to_thread(cache.mark_done, summary_type, [chunk for chunk, success in accepted.items() if success])
+        return [accepted.get(chunk, True) for chunk in chunks]
+    
+    async def _bounded(self, request_chunk, *args):
+        """Executa a requisição de um chunk respeitando o limite de concorrência"""
+        async with self._semaphore:
+            return await request_chunk(*args)
+    
     async def _request_activity_backfill_chunk(
         self,
-        start_date: datetime,
-        end_date: datetime,
+        start_ts: int,
+        end_ts: int,
         max_retries: int = 3
     ) -> bool:
-        """Faz uma requisição de backfill de atividades para um período de 30 dias"""
+        """
+        Faz uma requisição de backfill de atividades para um período de 30 dias
+        
+        start_ts/end_ts são epochs UTC em segundos (ver _chunk_ranges); os params
+        são montados uma vez e reaproveitados pelas tentativas.
+        """
         backfill_url = f"{settings.GARMIN_ACTIVITY_API_URL}/backfill/activities"
         params = {
-            "summaryStartTimeInSeconds": int(start_date.timestamp()),
-            "summaryEndTimeInSeconds": int(end_date.timestamp())
+            "summaryStartTimeInSeconds": start_ts,
+            "summaryEndTimeInSeconds": end_ts
         }
         
         for attempt in range(max_retries):
             try:
-                logger.info(f"Solicitando backfill de atividades: {start_date.date()} a {end_date.date()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Solicitando backfill de atividades: %s a %s", _utc_date(start_ts), _utc_date(end_ts))
                 
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        backfill_url,
-                        headers=self.headers,
-                        params=params,
-                        timeout=30.0
-                    )
+                await self._limiter.acquire()
+                response = await self._get_client().get(backfill_url, params=params)
+                self._limiter.update_from_headers(response.headers)
+                
+                if response.status_code == 202:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("✅ Backfill aceito: %s a %s", _utc_date(start_ts), _utc_date(end_ts))
+                    return True
+                elif response.status_code == 409:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("⚠️ Backfill duplicado (já foi solicitado): %s a %s", _utc_date(start_ts), _utc_date(end_ts))
+                    return True  # Consideramos sucesso pois o backfill já foi feito
+                elif response.status_code == 429:
+                    # Rate limit - aguardar e tentar novamente
+                    wait_time = _retry_wait_seconds(response, attempt)
+                    logger.warning("⏳ Rate limit atingido. Aguardando %ss antes de tentar novamente (tentativa %d/%d)...", wait_time, attempt + 1, max_retries)
+                    # Pausa o bucket inteiro: os outros chunks também esperam a cota voltar
+                    self._limiter.pause(wait_time)
+                    continue
+                else:
+                    logger.error("❌ Erro no backfill: %s - %s", response.status_code, _body_excerpt(response))
+                    if attempt == max_retries - 1:
+                        return False
+                    await asyncio.sleep(_backoff_seconds(attempt))
+                    continue
                     
-                    if response.status_code == 202:
-                        logger.info(f"✅ Backfill aceito: {start_date.date()} a {end_date.date()}")
-                        return True
-                    elif response.status_code == 409:
-                        logger.warning(f"⚠️ Backfill duplicado (já foi solicitado): {start_date.date()} a {end_date.date()}")
-                        return True  # Consideramos sucesso pois o backfill já foi feito
-                    elif response.status_code == 429:
-                        # Rate limit - aguardar e tentar novamente
-                        wait_time = (2 ** attempt) * 5  # 5s, 10s, 20s
-                        logger.warning(f"⏳ Rate limit atingido. Aguardando {wait_time}s antes de tentar novamente (tentativa {attempt + 1}/{max_retries})...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(f"❌ Erro no backfill: {response.status_code} - {response.text}")
-                        if attempt == max_retries - 1:
-                            return False
-                        await asyncio.sleep(2)
-                        continue
-                        
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:
-                    wait_time = (2 ** attempt) * 5
-                    logger.warning(f"⏳ Rate limit (HTTP). Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
+                    wait_time = _retry_wait_seconds(e.response, attempt)
+                    logger.warning("⏳ Rate limit (HTTP). Aguardando %ss...", wait_time)
+                    self._limiter.pause(wait_time)
                     continue
-                logger.error(f"Erro HTTP ao solicitar backfill: {e.response.status_code} - {e.response.text}")
+                logger.error("Erro HTTP ao solicitar backfill: %s - %s", e.response.status_code, _body_excerpt(e.response))
                 if attempt == max_retries - 1:
                     return False
-                await asyncio.sleep(2)
+                await asyncio.sleep(_backoff_seconds(attempt))
             except Exception as e:
-                logger.error(f"Exceção ao solicitar backfill: {e}")
+                logger.error("Exceção ao solicitar backfill: %s", e)
                 if attempt == max_retries - 1:
                     return False
-                await asyncio.sleep(2)
+                await asyncio.sleep(_backoff_seconds(attempt))
         
         return False
     
     async def _request_health_backfill_chunk(
         self,
         summary_type: str,
-        start_date: datetime,
-        end_date: datetime,
+        start_ts: int,
+        end_ts: int,
         max_retries: int = 3
     ) -> bool:
-        """Faz uma requisição de backfill de health data para um período de 90 dias"""
+        """
+        Faz uma requisição de backfill de health data para um período de 90 dias
+        
+        start_ts/end_ts são epochs UTC em segundos (ver _chunk_ranges); os params
+        são montados uma vez e reaproveitados pelas tentativas.
+        """
         backfill_url = f"https://apis.garmin.com/wellness-api/rest/backfill/{summary_type}"
         params = {
-            "summaryStartTimeInSeconds": int(start_date.timestamp()),
-            "summaryEndTimeInSeconds": int(end_date.timestamp())
+            "summaryStartTimeInSeconds": start_ts,
+            "summaryEndTimeInSeconds": end_ts
         }
         
         for attempt in range(max_retries):
             try:
-                logger.info(f"Solicitando backfill de {summary_type}: {start_date.date()} a {end_date.date()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Solicitando backfill de %s: %s a %s", summary_type, _utc_date(start_ts), _utc_date(end_ts))
                 
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        backfill_url,
-                        headers=self.headers,
-                        params=params,
-                        timeout=30.0
-                    )
+                await self._limiter.acquire()
+                response = await self._get_client().get(backfill_url, params=params)
+                self._limiter.update_from_headers(response.headers)
+                
+                if response.status_code == 202:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("✅ Backfill de %s aceito: %s a %s", summary_type, _utc_date(start_ts), _utc_date(end_ts))
+                    return True
+                elif response.status_code == 409:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("⚠️ Backfill duplicado de %s: %s a %s", summary_type, _utc_date(start_ts), _utc_date(end_ts))
+                    return True
+                elif response.status_code == 429:
+                    # Rate limit - aguardar e tentar novamente
+                    wait_time = _retry_wait_seconds(response, attempt)
+                    logger.warning("⏳ Rate limit atingido para %s. Aguardando %ss...", summary_type, wait_time)
+                    # Pausa o bucket inteiro: os outros chunks também esperam a cota voltar
+                    self._limiter.pause(wait_time)
+                    continue
+                else:
+                    logger.error("❌ Erro no backfill de %s: %s - %s", summary_type, response.status_code, _body_excerpt(response))
+                    if attempt == max_retries - 1:
+                        return False
+                    await asyncio.sleep(_backoff_seconds(attempt))
+                    continue
                     
-                    if response.status_code == 202:
-                        logger.info(f"✅ Backfill de {summary_type} aceito: {start_date.date()} a {end_date.date()}")
-                        return True
-                    elif response.status_code == 409:
-                        logger.warning(f"⚠️ Backfill duplicado de {summary_type}: {start_date.date()} a {end_date.date()}")
-                        return True
-                    elif response.status_code == 429:
-                        # Rate limit - aguardar e tentar novamente
-                        wait_time = (2 ** attempt) * 5  # 5s, 10s, 20s
-                        logger.warning(f"⏳ Rate limit atingido para {summary_type}. Aguardando {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(f"❌ Erro no backfill de {summary_type}: {response.status_code} - {response.text}")
-                        if attempt == max_retries - 1:
-                            return False
-                        await asyncio.sleep(2)
-                        continue
-                        
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:
-                    wait_time = (2 ** attempt) * 5
-                    logger.warning(f"⏳ Rate limit (HTTP) para {summary_type}. Aguardando {wait_time}s...")
-                    await asyncio.sleep(wait_time)
+                    wait_time = _retry_wait_seconds(e.response, attempt)
+                    logger.warning("⏳ Rate limit (HTTP) para %s. Aguardando %ss...", summary_type, wait_time)
+                    self._limiter.pause(wait_time)
                     continue
-                logger.error(f"Erro HTTP ao solicitar backfill de {summary_type}: {e.response.status_code} - {e.response.text}")
+                logger.error("Erro HTTP ao solicitar backfill de %s: %s - %s", summary_type, e.response.status_code, _body_excerpt(e.response))
                 if attempt == max_retries - 1:
                     return False
-                await asyncio.sleep(2)
+                await asyncio.sleep(_backoff_seconds(attempt))
             except Exception as e:
-                logger.error(f"Exceção ao solicitar backfill de {summary_type}: {e}")
+                logger.error("Exceção ao solicitar backfill de %s: %s", summary_type, e)
                 if attempt == max_retries - 1:
                     return False
-                await asyncio.sleep(2)
+                await asyncio.sleep(_backoff_seconds(attempt))
         
         return False
 
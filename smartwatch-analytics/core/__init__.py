@@ -4,7 +4,10 @@ Core FIT File System
 Sistema central para criação e leitura de arquivos FIT.
 """
 
-from .fit_creator import criar_treino_fit, ler_treino_fit, ler_atividade_fit
+from .fit_creator import (
+    criar_treino_fit, ler_treino_fit, ler_atividade_fit, extrair_dados_atividade,
+    criar_treinos_fit_bulk, ler_atividades_fit_bulk, encerrar_pool_bulk
+)
 
 __version__ = "1.0.0"
 __author__ = "Garmin Integration Team"
@@ -12,5 +15,9 @@ __author__ = "Garmin Integration Team"
 __all__ = [
     "criar_treino_fit",
     "ler_treino_fit", 
-    "ler_atividade_fit"
+    "ler_atividade_fit",
+    "extrair_dados_atividade",
+    "criar_treinos_fit_bulk",
+    "ler_atividades_fit_bulk",
+    "encerrar_pool_bulk"
 ] 
\ No newline at end of file
@@ -14,9 +14,12 @@ Suporta:
 
 import sys
 import os
-from typing import Dict, List, Any, Optional
+import importlib.util
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from collections import defaultdict
-from datetime import datetime
+from functools import cached_property
+from datetime import date, datetime
+from enum import Enum
 import json
 
 # Add parent directory to path for garmin_fit_sdk
@@ -24,26 +27,70 @@ parent_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if parent_path not in sys.path:
     sys.path.insert(0, parent_path)
 
+# O SDK só é importado no primeiro parse() (como em fit_creator): quem importa
+# este módulo sem decodificar arquivos não paga o import do decoder
+FIT_SDK_AVAILABLE = importlib.util.find_spec("garmin_fit_sdk") is not None
+if not FIT_SDK_AVAILABLE:
+    print("⚠️ Garmin FIT SDK não disponível")
+
+# orjson é opcional: sem a biblioteca, save_to_json usa o json da stdlib
 try:
-    from garmin_fit_sdk import Decoder, Stream
-    FIT_SDK_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Garmin FIT SDK não disponível: {e}")
-    FIT_SDK_AVAILABLE = False
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Chaves inteiras (campos sem nome no SDK) e arrays NumPy; datetimes saem
+    # em ISO 8601, igual a _json_default no caminho da stdlib
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _json_default(value: Any) -> Any:
+    """Serializa os tipos que o JSON não conhece (datetimes, bytes, enums, escalares NumPy)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Iterator):
+        return list(value)
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+# Campos de record consultados por get_metrics_summary
+SUMMARY_RECORD_FIELDS = frozenset({
+    'position_lat', 'position_long', 'heart_rate', 'power', 'cadence',
+    'fractional_cadence', 'temperature', 'vertical_oscillation', 'stance_time',
+    'left_torque_effectiveness',
+})
 
 
 class EnhancedFITParser:
     """Parser avançado de arquivos FIT com extração completa"""
     
+    # cached_properties recalculadas a cada parse()
+    _MEMOIZED = ('fields_report', 'metrics_summary')
+    
     def __init__(self):
         self.file_path = None
         self.messages = {}
         self.errors = []
         
-    def parse(self, file_path: str) -> Dict[str, Any]:
+    def parse(self, file_path: str, include_records: bool = True, include_raw: bool = False) -> Dict[str, Any]:
         """
         Parse completo do arquivo FIT
         
+        Args:
+            file_path: Caminho do arquivo FIT
+            include_records: Se False, omite 'records' (um dict por ponto); quem
+                só precisa de colunas pode lê-las de self.messages['record_mesgs']
+                sem a cópia
+            include_raw: Inclui 'raw_messages' (todas as mensagens do decoder,
+                em boa parte repetidas nas seções estruturadas)
+        
         Returns:
             Dict com todas as mensagens e dados estruturados
         """
@@ -51,6 +98,7 @@ class EnhancedFITParser:
         
         if not FIT_SDK_AVAILABLE:
             raise Exception("Garmin FIT SDK não disponível")
+        from garmin_fit_sdk import Decoder, Stream
         
         stream = Stream.from_file(file_path)
         decoder = Decoder(stream)
@@ -59,6 +107,9 @@ class EnhancedFITParser:
             raise Exception("Arquivo não é um FIT válido")
         
         self.messages, self.errors = decoder.read()
+        # Relatórios memoizados se referem ao arquivo anterior
+        for name in self._MEMOIZED:
+            self.__dict__.pop(name, None)
         
         # Estruturar dados
         structured_data = {
@@ -66,12 +117,12 @@ class EnhancedFITParser:
             'device_info': self._extract_device_info(),
             'activity_summary': self._extract_activity_summary(),
             'laps': self._extract_laps(),
-            'records': self._extract_records(),
+            **({'records': self._extract_records()} if include_records else {}),
             'sessions': self._extract_sessions(),
             'events': self._extract_events(),
             'hrv': self._extract_hrv(),
             'developer_fields': self._extract_developer_fields(),
-            'raw_messages': self._get_all_raw_messages(),
+            **({'raw_messages': self._get_all_raw_messages()} if include_raw else {}),
             'metadata': {
                 'parsed_at': datetime.now().isoformat(),
                 'file_path': file_path,
@@ -83,6 +134,24 @@ class EnhancedFITParser:
         
         return structured_data
     
+    def parse_with_status(self, file_path: str, include_records: bool = True,
+                          include_raw: bool = False) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Parse que não lança exceção e informa o quão completo foi o resultado
+        
+        Returns:
+            (dados, status): "ok" sem erros; "partial" quando o decoder reportou
+            erros e os dados contêm só o que foi decodificado; "failed" quando
+            nada pôde ser lido (dados None, motivo em self.errors)
+        """
+        try:
+            data = self.parse(file_path, include_records=include_records, include_raw=include_raw)
+        except Exception as e:
+            self.errors = [e]
+            return None, "failed"
+        
+        return data, ("partial" if self.errors else "ok")
+    
     def _extract_file_info(self) -> Dict:
         """Extrai informações do arquivo"""
         if 'file_id_mesgs' not in self.messages:
@@ -170,16 +239,18 @@ class EnhancedFITParser:
     
     def _extract_records(self) -> List[Dict]:
         """Extrai TODOS os records (pontos) com TODOS os campos"""
-        if 'record_mesgs' not in self.messages:
-            return []
+        return list(self.iter_records())
+    
+    def iter_records(self) -> Iterator[Dict]:
+        """
+        Records um a um, sem montar a lista inteira
         
-        records = []
-        for record in self.messages['record_mesgs']:
+        Pode ser passado como 'records' para save_to_json (com
+        parse(include_records=False)): cada ponto é copiado e gravado na hora.
+        """
+        for record in self.messages.get('record_mesgs', []):
             # Não filtrar - pegar TUDO
-            record_data = dict(record)
-            records.append(record_data)
-        
-        return records
+            yield dict(record)
     
     def _extract_events(self) -> List[Dict]:
         """Extrai eventos da atividade"""
@@ -216,31 +287,30 @@ class EnhancedFITParser:
         return developer_data
     
     def _get_all_raw_messages(self) -> Dict:
-        """Retorna TODAS as mensagens sem processamento"""
-        raw = {}
-        for msg_type, msg_list in self.messages.items():
-            raw[msg_type] = [dict(msg) for msg in msg_list]
-        
-        return raw
+        """Retorna TODAS as mensagens sem processamento (as listas do decoder, sem cópia)"""
+        return dict(self.messages)
     
     def get_available_fields_report(self) -> Dict[str, List[str]]:
         """
         Gera relatório de campos disponíveis por tipo de mensagem
         Útil para descobrir quais campos seu dispositivo fornece
         """
+        return dict(self.fields_report)
+    
+    @cached_property
+    def fields_report(self) -> Dict[str, List[str]]:
+        """Relatório de campos do último parse, calculado uma vez"""
         report = {}
         
         for msg_type, msg_list in self.messages.items():
             if not msg_list:
                 continue
             
-            # Coletar todos os campos únicos deste tipo
-            all_fields = set()
-            for msg in msg_list:
-                all_fields.update(msg.keys())
+            # Coletar todos os campos únicos deste tipo (união feita em C, de uma vez)
+            all_fields = set().union(*map(dict.keys, msg_list))
             
             # Converter para strings para garantir que são sortáveis
-            report[msg_type] = sorted([str(f) for f in all_fields])
+            report[msg_type] = sorted(map(str, all_fields))
         
         return report
     
@@ -249,6 +319,11 @@ class EnhancedFITParser:
         Gera resumo de métricas disponíveis
         Útil para analytics e dashboards
         """
+        return dict(self.metrics_summary)
+    
+    @cached_property
+    def metrics_summary(self) -> Dict[str, Any]:
+        """Resumo de métricas do último parse, calculado uma vez"""
         summary = {
             'has_gps': False,
             'has_heart_rate': False,
@@ -268,10 +343,12 @@ class EnhancedFITParser:
         if 'record_mesgs' in self.messages and self.messages['record_mesgs']:
             summary['total_records'] = len(self.messages['record_mesgs'])
             
-            # Verificar campos em todos os records
+            # Procurar só os campos que interessam, parando assim que todos aparecerem
             all_fields = set()
             for record in self.messages['record_mesgs']:
-                all_fields.update(record.keys())
+                all_fields |= SUMMARY_RECORD_FIELDS & record.keys()
+                if len(all_fields) == len(SUMMARY_RECORD_FIELDS):
+                    break
             
             summary['has_gps'] = 'position_lat' in all_fields or 'position_long' in all_fields
             summary['has_heart_rate'] = 'heart_rate' in all_fields
@@ -297,10 +374,61 @@ class EnhancedFITParser:
         
         return summary
     
-    def save_to_json(self, output_path: str, data: Dict[str, Any]) -> None:
-        """Salva dados parseados em JSON"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+    def save_to_json(self, output_path: str, data: Dict[str, Any], pretty: bool = True) -> None:
+        """
+        Salva dados parseados em JSON
+        
+        Com orjson, cada seção de primeiro nível é serializada e gravada
+        separadamente, e seções em lista (ou iteradores, como iter_records())
+        item a item: o pico de memória é o do maior item, não o do arquivo.
+        
+        Args:
+            output_path: Arquivo de saída
+            data: Dados retornados por parse(); seções podem ser iteradores
+            pretty: Indentar (2 espaços); False grava compacto, bem menor
+        """
+        if not ORJSON_AVAILABLE:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                if pretty:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
+                else:
+                    json.dump(data, f, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+            return
+        
+        if pretty:
+            option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+            first, separator, key_separator, end = b'{\n  ', b',\n  ', b': ', b'\n}'
+            item_first, item_separator, item_end = b'[\n    ', b',\n    ', b'\n  ]'
+        else:
+            option = _ORJSON_OPTIONS
+            first, separator, key_separator, end = b'{', b',', b':', b'}'
+            item_first, item_separator, item_end = b'[', b',', b']'
+        
+        with open(output_path, 'wb') as f:
+            if not data:
+                f.write(b'{}')
+                return
+            for index, (key, value) in enumerate(data.items()):
+                f.write(separator if index else first)
+                f.write(orjson.dumps(str(key)))
+                f.write(key_separator)
+                if isinstance(value, (list, tuple, Iterator)):
+                    count = 0
+                    for count, item in enumerate(value, 1):
+                        f.write(item_separator if count > 1 else item_first)
+                        item = orjson.dumps(item, default=_json_default, option=option)
+                        if pretty:
+                            # Itens indentados dois níveis (raiz + lista)
+                            item = item.replace(b'\n', b'\n    ')
+                        f.write(item)
+                    f.write(item_end if count else b'[]')
+                    continue
+                section = orjson.dumps(value, default=_json_default, option=option)
+                if pretty:
+                    # Seções indentadas um nível a mais, como dentro do objeto raiz
+                    section = section.replace(b'\n', b'\n  ')
+                f.write(section)
+            f.write(end)
 
 
 def analyze_fit_file(file_path: str, verbose: bool = True) -> Optional[Dict[str, Any]]:
@@ -316,7 +444,7 @@ def analyze_fit_file(file_path: str, verbose: bool = True) -> Optional[Dict[str,
     
     try:
         # Parse completo
-        data = parser.parse(file_path)
+        data = parser.parse(file_path, include_raw=True)
         
         if verbose:
             # Relatório de campos disponíveis
@@ -10,6 +10,8 @@ Funcionalidades:
 - criar_treino_fit(): Cria arquivos .FIT de treino a partir de estruturas simples
 - testar_arquivo_fit(): Valida arquivos .FIT usando o SDK oficial da Garmin
 - ler_atividade_fit(): Lê arquivos .FIT de atividades concluídas
+- extrair_dados_atividade(): Resumo de atividade a partir de mensagens já decodificadas
+- criar_treinos_fit_bulk() / ler_atividades_fit_bulk(): Lotes em paralelo (pool de processos)
 
 Uso:
     from garmin_fit_workout_creator import criar_treino_fit
@@ -27,7 +29,15 @@ Uso:
 """
 
 import os
+import sys
 import datetime
+import functools
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Any, Optional
 
 # Importações da biblioteca fit_tool
@@ -38,6 +48,92 @@ from fit_tool.profile.messages.workout_message import WorkoutMessage
 from fit_tool.profile.messages.workout_step_message import WorkoutStepMessage
 from fit_tool.profile.profile_type import Sport, Intensity, WorkoutStepDuration, WorkoutStepTarget, Manufacturer, FileType
 
+logger = logging.getLogger(__name__)
+
+# Diretório pai no path para o garmin_fit_sdk (como em enhanced_fit_parser), também
+# nos processos do pool, que importam este módulo por conta própria
+parent_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if parent_path not in sys.path:
+    sys.path.insert(0, parent_path)
+
+# SDK oficial da Garmin, usado só na leitura: importado no primeiro uso por _sdk()
+_Decoder = _Stream = None
+
+# NumPy só é necessário para records em colunas (layout="soa")
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Assinatura do cabeçalho FIT (bytes 8-11)
+_FIT_MAGIC = b".FIT"
+
+# Arquivos decodificados mantidos em memória (os mais recentes), por processo.
+# Cada entrada guarda todas as mensagens do arquivo: ~5 KB por record, ou ~20 MB
+# por hora de atividade gravada a 1 Hz. 0 desativa (ver FIT_DECODE_CACHE_SIZE em app/config.py)
+FIT_DECODE_CACHE_SIZE = int(os.getenv("FIT_DECODE_CACHE_SIZE", "4"))
+
+# Tipo do passo -> intensidade (chaves em minúsculas)
+_TIPO_MAPPING = {
+    "aquecimento": Intensity.WARMUP,
+    "corrida": Intensity.ACTIVE,
+    "desaquecimento": Intensity.COOLDOWN,
+    "warmup": Intensity.WARMUP,
+    "active": Intensity.ACTIVE,
+    "cooldown": Intensity.COOLDOWN
+}
+
+# Tipo de duração -> constante da biblioteca (chaves em minúsculas)
+_DURACAO_MAPPING = {
+    "tempo": WorkoutStepDuration.TIME,
+    "distancia": WorkoutStepDuration.DISTANCE,
+    "time": WorkoutStepDuration.TIME,
+    "distance": WorkoutStepDuration.DISTANCE
+}
+
+def _gravar_duracao_tempo(msg_step: WorkoutStepMessage, valor) -> None:
+    # Converter segundos para milissegundos; inteiros ficam na aritmética inteira
+    msg_step.duration_time = valor * 1000 if type(valor) is int else int(valor * 1000)
+
+def _gravar_duracao_distancia(msg_step: WorkoutStepMessage, valor) -> None:
+    # Compensar multiplicação automática do fit_tool; // evita a divisão em float
+    msg_step.duration_distance = valor // 10 if type(valor) is int and valor >= 0 else int(valor / 10)
+
+# Tipo de duração -> grava o valor do passo já na unidade esperada pelo fit_tool
+_DURACAO_WRITERS = {
+    WorkoutStepDuration.TIME: _gravar_duracao_tempo,
+    WorkoutStepDuration.DISTANCE: _gravar_duracao_distancia,
+}
+
+# Um FitFileBuilder por thread, limpo e reaproveitado a cada treino
+_builders = threading.local()
+
+# Pool das funções *_bulk: um processo por CPU, tarefas enviadas em blocos;
+# criado no primeiro lote e reaproveitado pelos seguintes
+FIT_BULK_MAX_WORKERS = os.cpu_count() or 1
+FIT_BULK_CHUNKSIZE = 16
+# Lotes menores que isso rodam em série no próprio processo
+FIT_BULK_MIN_BATCH = 4
+_pool_bulk: Optional[ProcessPoolExecutor] = None
+_pool_bulk_lock = threading.Lock()
+
+# Layouts de records: "aos" = lista de dicts por ponto, "soa" = dict de arrays NumPy
+RECORD_LAYOUTS = ("aos", "soa")
+# Campos numéricos dos records; no layout "soa" viram float64 com NaN onde faltam
+_RECORD_VALUE_FIELDS = ('position_lat', 'position_long', 'distance', 'speed', 'heart_rate')
+
+def _obter_builder() -> FitFileBuilder:
+    """FitFileBuilder da thread atual, sem mensagens nem definições de um treino anterior"""
+    builder = getattr(_builders, "builder", None)
+    if builder is None:
+        builder = _builders.builder = FitFileBuilder(auto_define=True, min_string_size=30)
+    else:
+        builder.records.clear()
+        builder.definition_map.clear()
+    return builder
+
 def criar_treino_fit(estrutura_treino: Dict[str, Any], nome_do_arquivo: str = "treino.fit") -> bool:
     """
     Cria um arquivo .FIT de treino a partir de uma estrutura de dados simples.
@@ -78,25 +174,8 @@ def criar_treino_fit(estrutura_treino: Dict[str, Any], nome_do_arquivo: str = "t
     try:
         print(f"🏃 Criando arquivo de treino: {nome_do_arquivo}")
         
-        # Mapeamento de tipos de treino para as constantes da biblioteca
-        tipo_mapping = {
-            "aquecimento": Intensity.WARMUP,
-            "corrida": Intensity.ACTIVE,
-            "desaquecimento": Intensity.COOLDOWN,
-            "warmup": Intensity.WARMUP,
-            "active": Intensity.ACTIVE,
-            "cooldown": Intensity.COOLDOWN
-        }
-        
-        duracao_mapping = {
-            "tempo": WorkoutStepDuration.TIME,
-            "distancia": WorkoutStepDuration.DISTANCE,
-            "time": WorkoutStepDuration.TIME,
-            "distance": WorkoutStepDuration.DISTANCE
-        }
-        
-        # Criar o builder
-        builder = FitFileBuilder(auto_define=True, min_string_size=30)
+        # Builder reaproveitado (por thread)
+        builder = _obter_builder()
         
         # Mensagem File ID (obrigatória)
         msg_file_id = FileIdMessage()
@@ -114,40 +193,50 @@ def criar_treino_fit(estrutura_treino: Dict[str, Any], nome_do_arquivo: str = "t
         msg_workout.num_valid_steps = len(estrutura_treino.get("passos", []))
         builder.add(msg_workout)
         
-        # Adicionar passos do treino
+        # Adicionar passos do treino (montados primeiro, adicionados de uma vez)
+        msgs_passos = []
         for i, passo in enumerate(estrutura_treino.get("passos", [])):
             msg_step = WorkoutStepMessage()
             msg_step.message_index = i
             msg_step.workout_step_name = passo.get("nome_passo", f"Passo {i+1}")
             
-            # Mapear tipo de intensidade
-            tipo_str = passo.get("tipo", "corrida").lower()
-            msg_step.intensity = tipo_mapping.get(tipo_str, Intensity.ACTIVE)
+            # Mapear tipo de intensidade (minúsculas só quando a chave exata não existe)
+            tipo_str = passo.get("tipo", "corrida")
+            intensidade = _TIPO_MAPPING.get(tipo_str)
+            if intensidade is None:
+                intensidade = _TIPO_MAPPING.get(tipo_str.lower(), Intensity.ACTIVE)
+            msg_step.intensity = intensidade
             
-            # Mapear tipo de duração
-            duracao_tipo_str = passo.get("duracao_tipo", "tempo").lower()
-            msg_step.duration_type = duracao_mapping.get(duracao_tipo_str, WorkoutStepDuration.TIME)
+            # Mapear tipo de duração; None = tipo desconhecido (TIME, sem valor)
+            duracao_tipo_str = passo.get("duracao_tipo", "tempo")
+            duracao = _DURACAO_MAPPING.get(duracao_tipo_str)
+            if duracao is None:
+                duracao = _DURACAO_MAPPING.get(duracao_tipo_str.lower())
+            msg_step.duration_type = WorkoutStepDuration.TIME if duracao is None else duracao
             
             # Definir valor da duração
-            duracao_valor = passo.get("duracao_valor", 0)
-            if duracao_tipo_str in ["tempo", "time"]:
-                duration_time_ms = int(duracao_valor * 1000)  # Converter segundos para milissegundos
-                msg_step.duration_time = duration_time_ms
-            elif duracao_tipo_str in ["distancia", "distance"]:
-                duration_distance_cm = int(duracao_valor / 10)  # Compensar multiplicação automática do fit_tool
-                msg_step.duration_distance = duration_distance_cm
+            if duracao is not None:
+                _DURACAO_WRITERS[duracao](msg_step, passo.get("duracao_valor", 0))
             
             # Definir tipo de target (aberto por padrão)
             msg_step.target_type = WorkoutStepTarget.OPEN
             
-            builder.add(msg_step)
-            print(f"✅ Passo {i+1}: {msg_step.workout_step_name}")
-        
-        # Construir e salvar o arquivo
-        fit_file = builder.build()
-        fit_file.to_file(nome_do_arquivo)
-        
-        tamanho_arquivo = os.path.getsize(nome_do_arquivo)
+            msgs_passos.append(msg_step)
+            logger.debug("Passo %d: %s", i + 1, msg_step.workout_step_name)
+        
+        builder.add_all(msgs_passos)
+        print(f"✅ {len(msgs_passos)} passos adicionados")
+        
+        # Construir e salvar o arquivo; build_bytes serializa os records uma
+        # vez só (build() + to_file() serializa duas: CRC e escrita)
+        if hasattr(builder, "build_bytes"):
+            conteudo = builder.build_bytes()
+        else:
+            conteudo = builder.build().to_bytes()
+        with open(nome_do_arquivo, 'wb') as f:
+            f.write(conteudo)
+        
+        tamanho_arquivo = len(conteudo)
         print(f"✅ Arquivo '{nome_do_arquivo}' criado com sucesso! ({tamanho_arquivo} bytes)")
         
         return True
@@ -156,6 +245,60 @@ def criar_treino_fit(estrutura_treino: Dict[str, Any], nome_do_arquivo: str = "t
         print(f"❌ Erro ao criar arquivo FIT: {e}")
         return False
 
+def _sdk():
+    """
+    (Decoder, Stream) do SDK oficial da Garmin, importados na primeira chamada
+    
+    Não depende da ordem de import dos módulos: se o SDK ainda não puder ser
+    importado, levanta ImportError e tenta de novo na próxima chamada.
+    """
+    global _Decoder, _Stream
+    if _Decoder is None:
+        try:
+            from garmin_fit_sdk import Decoder, Stream
+        except ImportError as e:
+            raise ImportError(f"Garmin FIT SDK não disponível: {e}") from e
+        _Decoder, _Stream = Decoder, Stream
+    return _Decoder, _Stream
+
+def _decodificar_fit(caminho_do_arquivo: str):
+    """
+    Decodifica um arquivo FIT, reaproveitando o resultado enquanto ele não mudar
+    
+    A chave inclui mtime e tamanho, então um arquivo regravado é decodificado de
+    novo. As mensagens são compartilhadas entre chamadas: não devem ser alteradas.
+    
+    Returns:
+        (messages, errors) de Decoder.read(), ou None se não for um arquivo FIT
+    """
+    _sdk()
+    
+    info = os.stat(caminho_do_arquivo)
+    return _decodificar_fit_cached(os.path.abspath(caminho_do_arquivo), info.st_mtime_ns, info.st_size)
+
+@functools.lru_cache(maxsize=FIT_DECODE_CACHE_SIZE)
+def _decodificar_fit_cached(caminho_abs: str, mtime_ns: int, tamanho: int):
+    # Arquivo lido de uma vez e fechado em seguida; o BytesIO compartilha os
+    # bytes sem copiar, e o decoder lê da memória em vez de um read() por campo
+    with open(caminho_abs, 'rb') as f:
+        # Rejeição rápida: todo cabeçalho FIT traz ".FIT" nos bytes 8-11
+        if f.read(12)[8:12] != _FIT_MAGIC:
+            return None
+        f.seek(0)
+        dados = f.read()
+    Decoder, Stream = _sdk()
+    decoder = Decoder(Stream.from_bytes_io(io.BytesIO(dados), len(dados)))
+    if not decoder.is_fit():
+        return None
+    return decoder.read()
+
+def _arquivo_integro(caminho_do_arquivo: str) -> bool:
+    """check_integrity() do SDK (tamanho, CRC do cabeçalho e do arquivo) sobre os bytes em memória"""
+    Decoder, Stream = _sdk()
+    with open(caminho_do_arquivo, 'rb') as f:
+        dados = f.read()
+    return Decoder(Stream.from_bytes_io(io.BytesIO(dados), len(dados))).check_integrity()
+
 def testar_arquivo_fit(nome_do_arquivo: str) -> bool:
     """
     Testa se o arquivo FIT criado é válido usando o SDK oficial da Garmin.
@@ -167,21 +310,19 @@ def testar_arquivo_fit(nome_do_arquivo: str) -> bool:
         bool: True se o arquivo é válido, False caso contrário
     """
     try:
-        from garmin_fit_sdk import Decoder, Stream
+        # Decodificação pelo cache; a integridade é conferida à parte pelo SDK
+        decodificado = _decodificar_fit(nome_do_arquivo)
         
-        stream = Stream.from_file(nome_do_arquivo)
-        decoder = Decoder(stream)
-        
-        if not decoder.is_fit():
+        if decodificado is None:
             print("❌ O arquivo não é um arquivo FIT válido")
             return False
             
-        if not decoder.check_integrity():
+        if not _arquivo_integro(nome_do_arquivo):
             print("❌ O arquivo não passou na verificação de integridade")
             return False
-            
-        messages, errors = decoder.read()
         
+        messages, errors = decodificado
+            
         if errors:
             print(f"⚠️  Avisos durante a leitura: {errors}")
         
@@ -197,7 +338,104 @@ def testar_arquivo_fit(nome_do_arquivo: str) -> bool:
         print(f"❌ Erro ao testar arquivo: {e}")
         return False
 
-def ler_atividade_fit(caminho_do_arquivo: str) -> Optional[Dict[str, Any]]:
+def _records_em_colunas(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Records como colunas NumPy alinhadas por índice (layout "soa")
+    
+    'timestamp' vira epoch UTC em segundos (int64, 0 se ausente); os demais
+    campos, float64 com NaN onde o ponto não tem o valor.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy não disponível para layout='soa'")
+    
+    count = len(records)
+    nan = float('nan')
+    colunas = {
+        'timestamp': np.fromiter(
+            (int(ts.timestamp()) if ts is not None else 0 for ts in (r.get('timestamp') for r in records)),
+            dtype=np.int64, count=count,
+        )
+    }
+    for campo in _RECORD_VALUE_FIELDS:
+        colunas[campo] = np.fromiter(
+            (nan if v is None else v for v in (r.get(campo) for r in records)),
+            dtype=np.float64, count=count,
+        )
+    return colunas
+
+def extrair_dados_atividade(messages: Dict[str, Any], layout: str = "aos",
+                             include_records: bool = True) -> Dict[str, Any]:
+    """
+    Extrai o resumo de atividade (sessão + records) de mensagens já decodificadas.
+    
+    Usada por ler_atividade_fit e por quem já tem as mensagens em memória
+    (ex.: EnhancedFITParser), evitando reabrir e redecodificar o arquivo.
+    
+    Args:
+        messages: Mensagens retornadas por Decoder.read()
+        layout: "aos" (padrão) devolve 'records' como lista de dicts, pronta
+            para JSON; "soa" devolve um dict campo -> array NumPy
+        include_records: Se False, 'records' sai vazio (só a sessão é extraída);
+            'total_records' continua sendo o número de pontos do arquivo
+    
+    Returns:
+        Dict com 'session', 'records' e 'total_records'
+    """
+    if layout not in RECORD_LAYOUTS:
+        raise ValueError(f"layout deve ser um de {RECORD_LAYOUTS}, não {layout!r}")
+    
+    # Extrair dados da sessão (se houver)
+    session_data = {}
+    session_mesgs = messages.get('session_mesgs')
+    if session_mesgs:
+        session = session_mesgs[0]
+        session_data = {
+            'sport': session.get('sport', 'unknown'),
+            'start_time': session.get('start_time', None),
+            'total_distance': session.get('total_distance', 0),
+            'total_elapsed_time': session.get('total_elapsed_time', 0),
+            'avg_speed': session.get('avg_speed', 0),
+            'avg_heart_rate': session.get('avg_heart_rate', 0),
+            'max_heart_rate': session.get('max_heart_rate', 0),
+            'total_calories': session.get('total_calories', 0)
+        }
+
+    # Extrair dados dos records (pontos GPS, etc.)
+    records = messages.get('record_mesgs', ())
+    if not include_records:
+        return {
+            'session': session_data,
+            'records': {} if layout == "soa" else [],
+            'total_records': len(records)
+        }
+    
+    if layout == "soa":
+        return {
+            'session': session_data,
+            'records': _records_em_colunas(records),
+            'total_records': len(records)
+        }
+    
+    record_data = [
+        {
+            'timestamp': record.get('timestamp'),
+            'position_lat': record.get('position_lat'),
+            'position_long': record.get('position_long'),
+            'distance': record.get('distance'),
+            'speed': record.get('speed'),
+            'heart_rate': record.get('heart_rate')
+        }
+        for record in records
+    ]
+
+    return {
+        'session': session_data,
+        'records': record_data,
+        'total_records': len(record_data)
+    }
+
+def ler_atividade_fit(caminho_do_arquivo: str, layout: str = "aos",
+                      include_records: bool = True) -> Optional[Dict[str, Any]]:
     """
     Lê um arquivo .FIT de uma atividade concluída e extrai dados de resumo.
     
@@ -206,64 +444,40 @@ def ler_atividade_fit(caminho_do_arquivo: str) -> Optional[Dict[str, Any]]:
     
     Args:
         caminho_do_arquivo: Caminho para o arquivo .FIT da atividade
+        layout: Formato de 'records', ver extrair_dados_atividade
+        include_records: Se False, pula a extração dos records (só a sessão)
     
     Returns:
         Dict com dados da atividade ou None se houver erro
+
+    Raises:
+        FileNotFoundError: se o arquivo não existir
+        ValueError: se o layout for desconhecido
     """
+    if layout not in RECORD_LAYOUTS:
+        raise ValueError(f"layout deve ser um de {RECORD_LAYOUTS}, não {layout!r}")
+    
     try:
-        from garmin_fit_sdk import Decoder, Stream
-        
         print(f"📖 Lendo arquivo de atividade: {caminho_do_arquivo}")
         
-        stream = Stream.from_file(caminho_do_arquivo)
-        decoder = Decoder(stream)
+        decodificado = _decodificar_fit(caminho_do_arquivo)
         
-        if not decoder.is_fit():
+        if decodificado is None:
             print("❌ O arquivo não é um arquivo FIT válido")
             return None
             
-        messages, errors = decoder.read()
+        messages, errors = decodificado
         
         if errors:
             print(f"⚠️  Avisos durante a leitura: {errors}")
         
-        # Extrair dados da sessão (se houver)
-        session_data = {}
-        if 'session_mesgs' in messages and messages['session_mesgs']:
-            session = messages['session_mesgs'][0]
-            session_data = {
-                'sport': session.get('sport', 'unknown'),
-                'start_time': session.get('start_time', None),
-                'total_distance': session.get('total_distance', 0),
-                'total_elapsed_time': session.get('total_elapsed_time', 0),
-                'avg_speed': session.get('avg_speed', 0),
-                'avg_heart_rate': session.get('avg_heart_rate', 0),
-                'max_heart_rate': session.get('max_heart_rate', 0),
-                'total_calories': session.get('total_calories', 0)
-            }
+        resultado = extrair_dados_atividade(messages, layout, include_records)
         
-        # Extrair dados dos records (pontos GPS, etc.)
-        record_data = []
-        if 'record_mesgs' in messages:
-            for record in messages['record_mesgs']:
-                record_data.append({
-                    'timestamp': record.get('timestamp', None),
-                    'position_lat': record.get('position_lat', None),
-                    'position_long': record.get('position_long', None),
-                    'distance': record.get('distance', None),
-                    'speed': record.get('speed', None),
-                    'heart_rate': record.get('heart_rate', None)
-                })
-        
-        resultado = {
-            'session': session_data,
-            'records': record_data,
-            'total_records': len(record_data)
-        }
-        
-        print(f"✅ Atividade lida com sucesso! {len(record_data)} pontos de dados")
+        print(f"✅ Atividade lida com sucesso! {resultado['total_records']} pontos de dados")
         return resultado
         
+    except FileNotFoundError:
+        raise
     except Exception as e:
         print(f"❌ Erro ao ler arquivo de atividade: {e}")
         return None
@@ -279,20 +493,20 @@ def ler_treino_fit(caminho_do_arquivo: str) -> Optional[Dict[str, Any]]:
     
     Returns:
         Dict com dados do treino ou None se houver erro
+
+    Raises:
+        FileNotFoundError: se o arquivo não existir
     """
     try:
-        from garmin_fit_sdk import Decoder, Stream
-        
         print(f"📖 Lendo arquivo de treino: {caminho_do_arquivo}")
         
-        stream = Stream.from_file(caminho_do_arquivo)
-        decoder = Decoder(stream)
+        decodificado = _decodificar_fit(caminho_do_arquivo)
         
-        if not decoder.is_fit():
+        if decodificado is None:
             print("❌ O arquivo não é um arquivo FIT válido")
             return None
             
-        messages, errors = decoder.read()
+        messages, errors = decodificado
         
         if errors:
             print(f"⚠️  Avisos durante a leitura: {errors}")
@@ -304,8 +518,9 @@ def ler_treino_fit(caminho_do_arquivo: str) -> Optional[Dict[str, Any]]:
         }
         
         # Extrair informações do arquivo
-        if 'file_id_mesgs' in messages and messages['file_id_mesgs']:
-            file_info = messages['file_id_mesgs'][0]
+        file_id_mesgs = messages.get('file_id_mesgs')
+        if file_id_mesgs:
+            file_info = file_id_mesgs[0]
             resultado['file_info'] = {
                 'type': file_info.get('type', 'unknown'),
                 'manufacturer': file_info.get('manufacturer', 'unknown'),
@@ -314,8 +529,9 @@ def ler_treino_fit(caminho_do_arquivo: str) -> Optional[Dict[str, Any]]:
             }
         
         # Extrair informações do workout
-        if 'workout_mesgs' in messages and messages['workout_mesgs']:
-            workout = messages['workout_mesgs'][0]
+        workout_mesgs = messages.get('workout_mesgs')
+        if workout_mesgs:
+            workout = workout_mesgs[0]
             resultado['workout'] = {
                 'sport': workout.get('sport', 'unknown'),
                 'workout_name': workout.get('wkt_name', ''),  # Campo correto
@@ -324,31 +540,117 @@ def ler_treino_fit(caminho_do_arquivo: str) -> Optional[Dict[str, Any]]:
             }
         
         # Extrair informações dos passos do workout
-        if 'workout_step_mesgs' in messages:
-            for step in messages['workout_step_mesgs']:
-                step_info = {
-                    'message_index': step.get('message_index', 0),
-                    'workout_step_name': step.get('wkt_step_name', ''),  # Campo correto
-                    'intensity': step.get('intensity', 'unknown'),
-                    'duration_type': step.get('duration_type', 'unknown'),
-                    'target_type': step.get('target_type', 'unknown')
-                }
-                
-                # Adicionar valores específicos de duração
-                if step.get('duration_type') == 'time':
-                    step_info['duration_time'] = step.get('duration_time', 0)  # Já está em segundos
-                elif step.get('duration_type') == 'distance':
-                    step_info['duration_distance'] = step.get('duration_distance', 0)  # Já está em metros
-                
-                resultado['workout_steps'].append(step_info)
+        for step in messages.get('workout_step_mesgs', ()):
+            duration_type = step.get('duration_type', 'unknown')
+            step_info = {
+                'message_index': step.get('message_index', 0),
+                'workout_step_name': step.get('wkt_step_name', ''),  # Campo correto
+                'intensity': step.get('intensity', 'unknown'),
+                'duration_type': duration_type,
+                'target_type': step.get('target_type', 'unknown')
+            }
+            
+            # Adicionar valores específicos de duração
+            if duration_type == 'time':
+                step_info['duration_time'] = step.get('duration_time', 0)  # Já está em segundos
+            elif duration_type == 'distance':
+                step_info['duration_distance'] = step.get('duration_distance', 0)  # Já está em metros
+            
+            resultado['workout_steps'].append(step_info)
         
         print(f"✅ Treino lido com sucesso! {len(resultado['workout_steps'])} passos encontrados")
         return resultado
         
+    except FileNotFoundError:
+        raise
     except Exception as e:
         print(f"❌ Erro ao ler arquivo de treino: {e}")
         return None
 
+def _obter_pool_bulk() -> ProcessPoolExecutor:
+    """Pool de processos compartilhado pelas funções *_bulk, criado no primeiro uso"""
+    global _pool_bulk
+    with _pool_bulk_lock:
+        if _pool_bulk is None:
+            # spawn: fork com threads do processo pai rodando pode travar o filho
+            _pool_bulk = ProcessPoolExecutor(max_workers=FIT_BULK_MAX_WORKERS,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return _pool_bulk
+
+def encerrar_pool_bulk() -> None:
+    """Encerra o pool das funções *_bulk (o próximo lote cria outro)"""
+    global _pool_bulk
+    with _pool_bulk_lock:
+        if _pool_bulk is not None:
+            _pool_bulk.shutdown(cancel_futures=True)
+            _pool_bulk = None
+
+def _executar_em_pool(funcao, argumentos: List[Any]) -> List[Any]:
+    """Aplica funcao (de módulo, para ser serializável) a cada argumento no pool de processos"""
+    if len(argumentos) < FIT_BULK_MIN_BATCH:
+        # Lote pequeno: o ida e volta ao pool custa mais que o trabalho
+        return [funcao(argumento) for argumento in argumentos]
+    
+    try:
+        return list(_obter_pool_bulk().map(funcao, argumentos, chunksize=FIT_BULK_CHUNKSIZE))
+    except BrokenProcessPool:
+        # Um processo morreu: descarta o pool para o próximo lote subir outro
+        encerrar_pool_bulk()
+        raise
+
+def _criar_treino_fit_worker(argumentos) -> Optional[str]:
+    estrutura_treino, nome_do_arquivo = argumentos
+    return nome_do_arquivo if criar_treino_fit(estrutura_treino, nome_do_arquivo) else None
+
+def _ler_atividade_fit_worker(argumentos) -> Optional[Dict[str, Any]]:
+    caminho_do_arquivo, layout, include_records = argumentos
+    try:
+        return ler_atividade_fit(caminho_do_arquivo, layout, include_records)
+    except FileNotFoundError:
+        print(f"❌ Arquivo não encontrado: {caminho_do_arquivo}")
+        return None
+
+def criar_treinos_fit_bulk(treinos: List[Dict[str, Any]], pasta_saida: str) -> List[Optional[str]]:
+    """
+    Cria vários arquivos .FIT de treino em paralelo, no pool de processos compartilhado.
+    
+    Args:
+        treinos: Estruturas de treino, no formato de criar_treino_fit
+        pasta_saida: Pasta onde os arquivos treino_<índice>.fit são gravados
+    
+    Returns:
+        Caminho de cada arquivo criado, na ordem de treinos (None para falhas)
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    return _executar_em_pool(_criar_treino_fit_worker, [
+        (treino, os.path.join(pasta_saida, f"treino_{i}.fit"))
+        for i, treino in enumerate(treinos)
+    ])
+
+def ler_atividades_fit_bulk(caminhos: List[str], layout: str = "aos",
+                            include_records: bool = True) -> List[Optional[Dict[str, Any]]]:
+    """
+    Lê vários arquivos .FIT de atividade em paralelo, no pool de processos compartilhado.
+    
+    Args:
+        caminhos: Caminhos dos arquivos .FIT
+        layout: Formato de 'records', ver extrair_dados_atividade
+        include_records: Ver ler_atividade_fit
+    
+    Returns:
+        Dados de cada atividade, na ordem de caminhos (None para erros e
+        arquivos ausentes)
+    
+    Raises:
+        ValueError: se o layout for desconhecido
+    """
+    if layout not in RECORD_LAYOUTS:
+        raise ValueError(f"layout deve ser um de {RECORD_LAYOUTS}, não {layout!r}")
+    
+    return _executar_em_pool(_ler_atividade_fit_worker, [
+        (caminho, layout, include_records) for caminho in caminhos
+    ])
+
 # Exemplo de uso e testes
 if __name__ == "__main__":
     print("🏃 Garmin FIT Workout Creator - Teste")
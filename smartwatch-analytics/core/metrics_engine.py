@@ -15,55 +15,167 @@ Métricas implementadas:
 - Trends & Comparisons
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
-import statistics
 from collections import defaultdict
 
+import numpy as np
+
+# Numba é opcional: sem ele os kernels rodam como NumPy vetorizado
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback sem Numba: devolve a função sem compilar"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Colunas extraídas dos records: (nome, campos em ordem de prioridade, dtype)
+# HR e cadência cabem em uint8 e potência em uint16 (tipos base do perfil FIT);
+# speed/altitude continuam float64 para não perder precisão nas métricas
+RECORD_FIELDS = (
+    ('heart_rate', ('heart_rate',), np.uint8),
+    ('speed', ('enhanced_speed', 'speed'), np.float64),
+    ('altitude', ('enhanced_altitude', 'altitude'), np.float64),
+    ('cadence', ('cadence',), np.uint8),
+    ('power', ('power',), np.uint16),
+)
+
+
+def build_record_columns(records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Converte os records (lista de dicts) em colunas NumPy alinhadas por índice
+    
+    Valores ausentes, None ou zero viram 0 - o mesmo critério de "valor
+    presente" usado pelas análises. Campos enhanced_* têm prioridade.
+    Nas colunas inteiras, valores fora da faixa do dtype (negativos, acima
+    do máximo ou NaN, p.ex. de um record corrompido) também viram 0 em vez
+    de derrubar a análise inteira.
+    
+    Args:
+        records: Lista de records do EnhancedFITParser
+        
+    Returns:
+        Dict nome -> array com len(records) posições
+    """
+    count = len(records)
+    columns = {}
+    for name, keys, dtype in RECORD_FIELDS:
+        if len(keys) == 1:
+            values = (r.get(keys[0]) or 0 for r in records)
+        else:
+            values = (r.get(keys[0]) or r.get(keys[1]) or 0 for r in records)
+        if dtype is np.float64:
+            columns[name] = np.fromiter(values, dtype=dtype, count=count)
+            continue
+        # Montada em float64 e validada antes de estreitar: fromiter direto no
+        # dtype estreito levanta OverflowError com um único valor fora da faixa
+        column = np.fromiter(values, dtype=np.float64, count=count)
+        column[~((column >= 0) & (column <= np.iinfo(dtype).max))] = 0
+        columns[name] = column.astype(dtype)
+    return columns
+
+
+# Assinaturas explícitas (dtypes das colunas de RECORD_FIELDS): os kernels compilam
+# no import - ou carregam do cache em disco - em vez de na primeira requisição
+@njit(['UniTuple(float64, 2)(uint8[:])',
+       'UniTuple(float64, 2)(uint16[:])',
+       'UniTuple(float64, 2)(float64[:])'], cache=True)
+def _mean_std(values):
+    """Média e desvio padrão amostral (ddof=1) de um array"""
+    n = values.size
+    mean = values.sum() / n
+    if n < 2:
+        return mean, 0.0
+    diff = values - mean
+    return mean, np.sqrt((diff * diff).sum() / (n - 1))
+
+
+@njit(['float64(uint8[:])', 'float64(float64[:])'], cache=True)
+def _consistency(values):
+    """Score de consistência (0-100): 100 menos o coeficiente de variação (%)"""
+    if values.size < 2:
+        return 100.0
+    mean, std_dev = _mean_std(values)
+    if mean == 0:
+        return 0.0
+    return max(0.0, 100.0 - (std_dev / mean) * 100)
+
+
+@njit(['int64[:](uint8[:], float64[:])', 'int64[:](uint16[:], float64[:])'], cache=True)
+def _bin_counts(values, edges):
+    """Conta as amostras em cada faixa contígua [edges[i], edges[i+1]) numa só passada"""
+    bins = edges.size - 1
+    index = np.searchsorted(edges, values, side='right') - 1
+    return np.bincount(index[(index >= 0) & (index < bins)], minlength=bins)
+
 
 class MetricsEngine:
     """Engine para cálculo de métricas avançadas"""
     
+    # Grupos de métricas de analyze_activity: (chave no resultado, método analisador)
+    ANALYZERS = (
+        ('basic_stats', '_calculate_basic_stats'),
+        ('heart_rate_analysis', '_analyze_heart_rate'),
+        ('pace_speed_analysis', '_analyze_pace_speed'),
+        ('elevation_analysis', '_analyze_elevation'),
+        ('cadence_analysis', '_analyze_cadence'),
+        ('power_analysis', '_analyze_power'),
+        ('running_dynamics', '_analyze_running_dynamics'),
+        ('splits', '_calculate_splits'),
+        ('zones', '_calculate_zones'),
+        ('efficiency_metrics', '_calculate_efficiency'),
+        ('fatigue_analysis', '_analyze_fatigue'),
+        ('performance_score', '_calculate_performance_score'),
+    )
+    
     def __init__(self):
         self.activity_data = None
+        self.columns = None
+        self._session = None
         
-    def analyze_activity(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_activity(self, activity_data: Dict[str, Any],
+                         columns: Optional[Dict[str, np.ndarray]] = None,
+                         include: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
         Análise completa de uma atividade com métricas avançadas
         
         Args:
             activity_data: Dados parseados do EnhancedFITParser
+            columns: Colunas de build_record_columns (montadas aqui se omitidas)
+            include: Grupos de métricas a calcular (chaves de ANALYZERS);
+                None calcula todos
             
         Returns:
             Dict com métricas avançadas calculadas
         """
         self.activity_data = activity_data
+        # Primeira sessão, lida uma vez para todos os analisadores (None se não houver)
+        self._session = (activity_data.get('sessions') or [None])[0]
+        if columns is None:
+            columns = build_record_columns(activity_data.get('records', []))
+        self.columns = columns
         
+        # Só os analisadores pedidos rodam; a ordem das chaves segue ANALYZERS
         metrics = {
-            'basic_stats': self._calculate_basic_stats(),
-            'heart_rate_analysis': self._analyze_heart_rate(),
-            'pace_speed_analysis': self._analyze_pace_speed(),
-            'elevation_analysis': self._analyze_elevation(),
-            'cadence_analysis': self._analyze_cadence(),
-            'power_analysis': self._analyze_power(),
-            'running_dynamics': self._analyze_running_dynamics(),
-            'splits': self._calculate_splits(),
-            'zones': self._calculate_zones(),
-            'efficiency_metrics': self._calculate_efficiency(),
-            'fatigue_analysis': self._analyze_fatigue(),
-            'performance_score': self._calculate_performance_score(),
+            key: getattr(self, method)()
+            for key, method in self.ANALYZERS
+            if include is None or key in include
         }
         
         return metrics
     
     def _calculate_basic_stats(self) -> Dict[str, Any]:
         """Estatísticas básicas da atividade"""
-        sessions = self.activity_data.get('sessions', [])
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         total_distance = session.get('total_distance', 0)
         total_time = session.get('total_timer_time', 0)
         
@@ -85,94 +197,72 @@ class MetricsEngine:
     
     def _analyze_heart_rate(self) -> Dict[str, Any]:
         """Análise avançada de frequência cardíaca"""
-        sessions = self.activity_data.get('sessions', [])
-        records = self.activity_data.get('records', [])
-        
-        if not sessions or not records:
+        session = self._session
+        if session is None or not self.columns['heart_rate'].size:
             return {}
         
-        session = sessions[0]
-        
-        # Extrair HR de todos os records
-        hr_values = [r.get('heart_rate') for r in records if r.get('heart_rate')]
+        # HR de todos os records
+        hr_values = self._present('heart_rate')
         
-        if not hr_values:
+        if not hr_values.size:
             return {
                 'avg': session.get('avg_heart_rate'),
                 'max': session.get('max_heart_rate'),
                 'min': session.get('min_heart_rate'),
             }
         
-        # Calcular variabilidade
-        hr_variability = statistics.stdev(hr_values) if len(hr_values) > 1 else 0
+        # Média e variabilidade (kernel compilado)
+        hr_mean, hr_std = _mean_std(hr_values)
+        hr_max = int(hr_values.max())
         
         # Zonas de FC (simplificado - pode usar HR max do usuário)
-        max_hr = session.get('max_heart_rate', max(hr_values))
-        zones = self._calculate_hr_zones(hr_values, max_hr)
+        max_hr = session.get('max_heart_rate', hr_max)
+        zones, time_in_zones = self._calculate_hr_zones(hr_values, max_hr)
         
         # Análise de tendência
         hr_drift = self._calculate_hr_drift(hr_values)
         
         return {
-            'avg': round(statistics.mean(hr_values), 1),
-            'max': max(hr_values),
-            'min': min(hr_values),
-            'median': statistics.median(hr_values),
-            'std_dev': round(hr_variability, 2),
+            'avg': round(float(hr_mean), 1),
+            'max': hr_max,
+            'min': int(hr_values.min()),
+            'median': self._median(hr_values),
+            'std_dev': round(float(hr_std), 2) if hr_values.size > 1 else 0,
             'zones': zones,
             'hr_drift_percent': hr_drift,
-            'time_in_zones': self._time_in_hr_zones(hr_values),
+            'time_in_zones': time_in_zones,
         }
     
-    def _calculate_hr_zones(self, hr_values: List[int], max_hr: int) -> Dict[str, Any]:
-        """Calcula distribuição em zonas de FC"""
+    def _calculate_hr_zones(self, hr_values: np.ndarray, max_hr: int) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """
+        Calcula distribuição em zonas de FC e o tempo em cada uma
+        
+        O tempo vem da mesma contagem (assumindo 1 record/segundo).
+        """
         zones = {
-            'zone1': {'name': 'Recovery', 'range': (0, 0.6 * max_hr), 'count': 0},
-            'zone2': {'name': 'Endurance', 'range': (0.6 * max_hr, 0.7 * max_hr), 'count': 0},
-            'zone3': {'name': 'Tempo', 'range': (0.7 * max_hr, 0.8 * max_hr), 'count': 0},
-            'zone4': {'name': 'Threshold', 'range': (0.8 * max_hr, 0.9 * max_hr), 'count': 0},
-            'zone5': {'name': 'VO2 Max', 'range': (0.9 * max_hr, max_hr), 'count': 0},
+            'zone1': {'name': 'Recovery', 'range': (0, 0.6 * max_hr), 'count': 0, 'percentage': 0.0},
+            'zone2': {'name': 'Endurance', 'range': (0.6 * max_hr, 0.7 * max_hr), 'count': 0, 'percentage': 0.0},
+            'zone3': {'name': 'Tempo', 'range': (0.7 * max_hr, 0.8 * max_hr), 'count': 0, 'percentage': 0.0},
+            'zone4': {'name': 'Threshold', 'range': (0.8 * max_hr, 0.9 * max_hr), 'count': 0, 'percentage': 0.0},
+            'zone5': {'name': 'VO2 Max', 'range': (0.9 * max_hr, max_hr), 'count': 0, 'percentage': 0.0},
         }
         
-        for hr in hr_values:
-            for zone_key, zone_data in zones.items():
-                if zone_data['range'][0] <= hr < zone_data['range'][1]:
-                    zone_data['count'] += 1
-                    break
+        # Faixas contíguas: um histograma só, em vez de uma passada por zona.
+        # A zona 5 é aberta em cima: amostras acima do max_hr da sessão contam
+        # nela, e os segundos das zonas somam o total de amostras
+        edges = np.array([0, 0.6 * max_hr, 0.7 * max_hr, 0.8 * max_hr, 0.9 * max_hr, np.inf], dtype=np.float64)
+        counts = _bin_counts(hr_values, edges)
         
         total = len(hr_values)
-        for zone_data in zones.values():
+        time_in_zones = {}
+        for zone_name, zone_data, count in zip(zones, zones.values(), counts):
+            zone_data['count'] = int(count)
             zone_data['percentage'] = round((zone_data['count'] / total * 100), 1) if total > 0 else 0
+            time_in_zones[f'{zone_name}_seconds'] = zone_data['count']
         
-        return zones
-    
-    def _time_in_hr_zones(self, hr_values: List[int]) -> Dict[str, int]:
-        """Tempo gasto em cada zona (assumindo 1 record/segundo)"""
-        max_hr = max(hr_values) if hr_values else 180
-        
-        zone_times = {
-            'zone1_seconds': 0,
-            'zone2_seconds': 0,
-            'zone3_seconds': 0,
-            'zone4_seconds': 0,
-            'zone5_seconds': 0,
-        }
-        
-        for hr in hr_values:
-            if hr < 0.6 * max_hr:
-                zone_times['zone1_seconds'] += 1
-            elif hr < 0.7 * max_hr:
-                zone_times['zone2_seconds'] += 1
-            elif hr < 0.8 * max_hr:
-                zone_times['zone3_seconds'] += 1
-            elif hr < 0.9 * max_hr:
-                zone_times['zone4_seconds'] += 1
-            else:
-                zone_times['zone5_seconds'] += 1
-        
-        return zone_times
+        return zones, time_in_zones
     
-    def _calculate_hr_drift(self, hr_values: List[int]) -> float:
+    def _calculate_hr_drift(self, hr_values: np.ndarray) -> float:
         """Calcula drift de FC (primeira vs segunda metade)"""
         if len(hr_values) < 20:
             return 0.0
@@ -181,22 +271,18 @@ class MetricsEngine:
         first_half = hr_values[:mid]
         second_half = hr_values[mid:]
         
-        avg_first = statistics.mean(first_half)
-        avg_second = statistics.mean(second_half)
+        avg_first = float(np.mean(first_half))
+        avg_second = float(np.mean(second_half))
         
         drift = ((avg_second - avg_first) / avg_first) * 100
         return round(drift, 2)
     
     def _analyze_pace_speed(self) -> Dict[str, Any]:
         """Análise de pace/velocidade"""
-        sessions = self.activity_data.get('sessions', [])
-        records = self.activity_data.get('records', [])
-        
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         # Usar enhanced_avg_speed se disponível, senão avg_speed
         avg_speed_ms = session.get('enhanced_avg_speed') or session.get('avg_speed', 0)
         max_speed_ms = session.get('enhanced_max_speed') or session.get('max_speed', 0)
@@ -219,24 +305,19 @@ class MetricsEngine:
             result['avg_pace_min_per_mile'] = self._format_pace(pace_min_per_mile)
         
         # Análise de variabilidade de speed nos records
-        if records:
-            speeds = [r.get('enhanced_speed') or r.get('speed', 0) for r in records if r.get('speed') or r.get('enhanced_speed')]
-            if speeds:
-                result['speed_variability'] = round(statistics.stdev(speeds), 3) if len(speeds) > 1 else 0
-                result['consistency_score'] = self._calculate_consistency(speeds)
+        speeds = self._present('speed')
+        if speeds.size:
+            result['speed_variability'] = round(float(_mean_std(speeds)[1]), 3) if speeds.size > 1 else 0
+            result['consistency_score'] = self._calculate_consistency(speeds)
         
         return result
     
     def _analyze_elevation(self) -> Dict[str, Any]:
         """Análise de elevação"""
-        sessions = self.activity_data.get('sessions', [])
-        records = self.activity_data.get('records', [])
-        
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         result = {
             'total_ascent': session.get('total_ascent', 0),
             'total_descent': session.get('total_descent', 0),
@@ -249,47 +330,37 @@ class MetricsEngine:
         }
         
         # Análise de elevação ao longo do tempo
-        if records:
-            altitudes = [r.get('enhanced_altitude') or r.get('altitude') for r in records if r.get('altitude') or r.get('enhanced_altitude')]
-            if altitudes:
-                result['altitude_variability'] = round(statistics.stdev(altitudes), 2) if len(altitudes) > 1 else 0
+        altitudes = self._present('altitude')
+        if altitudes.size:
+            result['altitude_variability'] = round(float(_mean_std(altitudes)[1]), 2) if altitudes.size > 1 else 0
         
         return result
     
     def _analyze_cadence(self) -> Dict[str, Any]:
         """Análise de cadência"""
-        sessions = self.activity_data.get('sessions', [])
-        records = self.activity_data.get('records', [])
-        
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         result = {
             'avg_cadence': session.get('avg_cadence') or session.get('avg_running_cadence'),
             'max_cadence': session.get('max_cadence') or session.get('max_running_cadence'),
         }
         
         # Análise detalhada de cadência
-        if records:
-            cadences = [r.get('cadence') for r in records if r.get('cadence')]
-            if cadences:
-                result['cadence_std_dev'] = round(statistics.stdev(cadences), 2) if len(cadences) > 1 else 0
-                result['cadence_consistency'] = self._calculate_consistency(cadences)
+        cadences = self._present('cadence')
+        if cadences.size:
+            result['cadence_std_dev'] = round(float(_mean_std(cadences)[1]), 2) if cadences.size > 1 else 0
+            result['cadence_consistency'] = self._calculate_consistency(cadences)
         
         return result
     
     def _analyze_power(self) -> Dict[str, Any]:
         """Análise de potência (ciclismo/corrida)"""
-        sessions = self.activity_data.get('sessions', [])
-        records = self.activity_data.get('records', [])
-        
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         result = {
             'avg_power': session.get('avg_power'),
             'max_power': session.get('max_power'),
@@ -300,22 +371,18 @@ class MetricsEngine:
         }
         
         # Power zones
-        if records:
-            powers = [r.get('power') for r in records if r.get('power')]
-            if powers:
-                result['power_variability'] = round(statistics.stdev(powers), 2) if len(powers) > 1 else 0
+        powers = self._present('power')
+        if powers.size:
+            result['power_variability'] = round(float(_mean_std(powers)[1]), 2) if powers.size > 1 else 0
         
         return result
     
     def _analyze_running_dynamics(self) -> Dict[str, Any]:
         """Análise de running dynamics"""
-        sessions = self.activity_data.get('sessions', [])
-        
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         return {
             'vertical_oscillation': session.get('avg_vertical_oscillation'),
             'vertical_ratio': session.get('avg_vertical_ratio'),
@@ -354,59 +421,53 @@ class MetricsEngine:
     
     def _calculate_zones(self) -> Dict[str, Any]:
         """Calcula tempo em diferentes zonas de treinamento"""
-        records = self.activity_data.get('records', [])
-        
-        if not records:
+        if not self.columns['power'].size:
             return {}
         
         # Zonas baseadas em HR (já calculado em heart_rate_analysis)
         # Adicionar zonas de power se disponível
-        powers = [r.get('power') for r in records if r.get('power')]
+        powers = self._present('power')
         
         zones = {}
         
-        if powers:
+        if powers.size:
             zones['power_zones'] = self._calculate_power_zones(powers)
         
         return zones
     
-    def _calculate_power_zones(self, powers: List[int]) -> Dict[str, Any]:
+    def _calculate_power_zones(self, powers: np.ndarray) -> Dict[str, Any]:
         """Calcula zonas de potência"""
-        if not powers:
+        if not len(powers):
             return {}
         
-        avg_power = statistics.mean(powers)
+        avg_power = float(np.mean(powers))
         
         # Zonas simplificadas (idealmente usar FTP do usuário)
         zones = {
-            'zone1': {'name': 'Active Recovery', 'range': (0, 0.55 * avg_power), 'count': 0},
-            'zone2': {'name': 'Endurance', 'range': (0.55 * avg_power, 0.75 * avg_power), 'count': 0},
-            'zone3': {'name': 'Tempo', 'range': (0.75 * avg_power, 0.9 * avg_power), 'count': 0},
-            'zone4': {'name': 'Threshold', 'range': (0.9 * avg_power, 1.05 * avg_power), 'count': 0},
-            'zone5': {'name': 'VO2 Max', 'range': (1.05 * avg_power, float('inf')), 'count': 0},
+            'zone1': {'name': 'Active Recovery', 'range': (0, 0.55 * avg_power), 'count': 0, 'percentage': 0.0},
+            'zone2': {'name': 'Endurance', 'range': (0.55 * avg_power, 0.75 * avg_power), 'count': 0, 'percentage': 0.0},
+            'zone3': {'name': 'Tempo', 'range': (0.75 * avg_power, 0.9 * avg_power), 'count': 0, 'percentage': 0.0},
+            'zone4': {'name': 'Threshold', 'range': (0.9 * avg_power, 1.05 * avg_power), 'count': 0, 'percentage': 0.0},
+            'zone5': {'name': 'VO2 Max', 'range': (1.05 * avg_power, float('inf')), 'count': 0, 'percentage': 0.0},
         }
         
-        for power in powers:
-            for zone_data in zones.values():
-                if zone_data['range'][0] <= power < zone_data['range'][1]:
-                    zone_data['count'] += 1
-                    break
+        edges = np.array([0, 0.55 * avg_power, 0.75 * avg_power, 0.9 * avg_power, 1.05 * avg_power, np.inf],
+                         dtype=np.float64)
+        counts = _bin_counts(powers, edges)
         
         total = len(powers)
-        for zone_data in zones.values():
+        for zone_data, count in zip(zones.values(), counts):
+            zone_data['count'] = int(count)
             zone_data['percentage'] = round((zone_data['count'] / total * 100), 1) if total > 0 else 0
         
         return zones
     
     def _calculate_efficiency(self) -> Dict[str, Any]:
         """Calcula métricas de eficiência"""
-        sessions = self.activity_data.get('sessions', [])
-        
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         # Efficiency metrics
         result = {}
         
@@ -429,42 +490,45 @@ class MetricsEngine:
     
     def _analyze_fatigue(self) -> Dict[str, Any]:
         """Análise de fadiga durante atividade"""
-        records = self.activity_data.get('records', [])
+        hr_column = self.columns['heart_rate']
+        speed_column = self.columns['speed']
         
-        if not records or len(records) < 10:
+        if len(hr_column) < 10:
             return {}
         
         # Dividir em quartis
-        quartile_size = len(records) // 4
-        quartiles = [
-            records[:quartile_size],
-            records[quartile_size:2*quartile_size],
-            records[2*quartile_size:3*quartile_size],
-            records[3*quartile_size:],
+        quartile_size = len(hr_column) // 4
+        bounds = [
+            (0, quartile_size),
+            (quartile_size, 2*quartile_size),
+            (2*quartile_size, 3*quartile_size),
+            (3*quartile_size, len(hr_column)),
         ]
         
         fatigue_indicators = {}
         
         # Análise de HR por quartil
         hr_by_quartile = []
-        for i, q in enumerate(quartiles):
-            hrs = [r.get('heart_rate') for r in q if r.get('heart_rate')]
-            if hrs:
+        for i, (start, end) in enumerate(bounds):
+            hrs = hr_column[start:end]
+            hrs = hrs[hrs != 0]
+            if hrs.size:
                 hr_by_quartile.append({
                     'quartile': i + 1,
-                    'avg_hr': round(statistics.mean(hrs), 1)
+                    'avg_hr': round(float(hrs.mean()), 1)
                 })
         
         fatigue_indicators['hr_progression'] = hr_by_quartile
         
         # Análise de speed por quartil
         speed_by_quartile = []
-        for i, q in enumerate(quartiles):
-            speeds = [r.get('enhanced_speed') or r.get('speed', 0) for r in q if r.get('speed') or r.get('enhanced_speed')]
-            if speeds:
+        for i, (start, end) in enumerate(bounds):
+            speeds = speed_column[start:end]
+            speeds = speeds[speeds != 0]
+            if speeds.size:
                 speed_by_quartile.append({
                     'quartile': i + 1,
-                    'avg_speed_kmh': round(statistics.mean(speeds) * 3.6, 2)
+                    'avg_speed_kmh': round(float(speeds.mean()) * 3.6, 2)
                 })
         
         fatigue_indicators['speed_progression'] = speed_by_quartile
@@ -482,13 +546,10 @@ class MetricsEngine:
     
     def _calculate_performance_score(self) -> Dict[str, Any]:
         """Calcula score de performance geral"""
-        sessions = self.activity_data.get('sessions', [])
-        
-        if not sessions:
+        session = self._session
+        if session is None:
             return {}
         
-        session = sessions[0]
-        
         # Score baseado em training effect, TSS, etc.
         score = {
             'training_effect': session.get('total_training_effect'),
@@ -497,56 +558,50 @@ class MetricsEngine:
         }
         
         # Calcular score agregado (0-100)
-        # Simplificado - pode ser mais sofisticado
-        factors = []
-        
+        # Simplificado - pode ser mais sofisticado; fator ausente entra como NaN
         te = session.get('total_training_effect', 0)
-        if te:
-            factors.append(min(te / 5.0 * 100, 100))  # TE máx ~5.0
-        
         tss = session.get('training_stress_score', 0)
-        if tss:
-            factors.append(min(tss / 200 * 100, 100))  # TSS 200 = muito alto
+        factors = np.array([
+            te / 5.0 * 100 if te else np.nan,  # TE máx ~5.0
+            tss / 200 * 100 if tss else np.nan,  # TSS 200 = muito alto
+        ])
+        factors = factors[~np.isnan(factors)]
         
-        if factors:
-            score['overall_score'] = round(statistics.mean(factors), 1)
+        if factors.size:
+            score['overall_score'] = round(float(np.clip(factors, 0, 100).mean()), 1)
         
         return score
     
     # Utility methods
-    def _format_duration(self, seconds: float) -> str:
+    def _present(self, name: str) -> np.ndarray:
+        """Valores presentes (não-zero) de uma coluna dos records"""
+        column = self.columns[name]
+        return column[column != 0]
+    
+    @staticmethod
+    def _format_duration(seconds: float) -> str:
         """Formata duração em HH:MM:SS"""
-        if not seconds:
-            return "00:00:00"
-        
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        
+        hours, rest = divmod(int(seconds or 0), 3600)
+        minutes, secs = divmod(rest, 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     
-    def _format_pace(self, pace_minutes: float) -> str:
+    @staticmethod
+    def _format_pace(pace_minutes: float) -> str:
         """Formata pace em MM:SS"""
-        minutes = int(pace_minutes)
-        seconds = int((pace_minutes - minutes) * 60)
-        return f"{minutes:02d}:{seconds:02d}"
+        minutes, frac = divmod(pace_minutes, 1)
+        return f"{int(minutes):02d}:{int(frac * 60):02d}"
     
-    def _calculate_consistency(self, values: List[float]) -> float:
-        """Calcula score de consistência (0-100)"""
-        if not values or len(values) < 2:
-            return 100.0
-        
-        avg = statistics.mean(values)
-        std_dev = statistics.stdev(values)
-        
-        if avg == 0:
-            return 0.0
-        
-        # Coefficient of variation invertido
-        cv = (std_dev / avg) * 100
-        consistency = max(0, 100 - cv)
-        
-        return round(consistency, 2)
+    def _median(self, values: np.ndarray) -> float:
+        """Mediana com o mesmo tipo de retorno de statistics.median"""
+        ordered = np.sort(values)
+        mid = ordered.size // 2
+        if ordered.size % 2:
+            return ordered[mid].item()
+        return (ordered[mid - 1].item() + ordered[mid].item()) / 2
+    
+    def _calculate_consistency(self, values: np.ndarray) -> float:
+        """Calcula score de consistência (0-100), coeficiente de variação invertido"""
+        return round(float(_consistency(values)), 2)
 
 
 if __name__ == "__main__":